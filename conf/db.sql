@@ -6,7 +6,8 @@ CREATE TABLE annual_reports (
     publish_date DATE,
     file_path VARCHAR(255),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    UNIQUE KEY uk_code_year (stock_code, report_year)
+    UNIQUE KEY uk_code_year (stock_code, report_year),
+    KEY idx_reports_publish_date (publish_date, stock_code)
 );
 
 
@@ -19,6 +20,7 @@ CREATE TABLE annual_report_mda (
     future_section LONGTEXT,
     full_mda LONGTEXT,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    KEY idx_mda_created_at_report (created_at, report_id),
     FOREIGN KEY (report_id) REFERENCES annual_reports(id)
 );
 
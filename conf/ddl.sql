@@ -34,7 +34,8 @@ CREATE TABLE `annual_reports` (
   `score_updated_at` datetime DEFAULT NULL,
   PRIMARY KEY (`id`),
   UNIQUE KEY `uk_code_year` (`stock_code`,`report_year`),
-  UNIQUE KEY `uq_stock_year` (`stock_code`,`report_year`)
+  UNIQUE KEY `uq_stock_year` (`stock_code`,`report_year`),
+  KEY `idx_reports_publish_date` (`publish_date`,`stock_code`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1697 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
 
@@ -56,6 +57,7 @@ CREATE TABLE `annual_report_mda` (
   `chairman_letter` longtext COLLATE utf8mb4_general_ci,
   PRIMARY KEY (`id`),
   KEY `report_id` (`report_id`),
+  KEY `idx_mda_created_at_report` (`created_at`,`report_id`),
   CONSTRAINT `annual_report_mda_ibfk_1` FOREIGN KEY (`report_id`) REFERENCES `annual_reports` (`id`)
 ) ENGINE=InnoDB AUTO_INCREMENT=1625 DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
 /*!40101 SET character_set_client = @saved_cs_client */;
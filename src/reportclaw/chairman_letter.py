@@ -3,7 +3,7 @@ from __future__ import annotations
 import re
 from typing import Callable
 
-from pdfminer.high_level import extract_text as pdfminer_extract_text
+from reportclaw.pdf_text import extract_text as pdf_extract_text
 
 
 def normalize_for_letter(text: str, *, preprocess_text: Callable[[str], str]) -> str:
@@ -51,8 +51,10 @@ def extract_chairman_letter(
     normalize_for_letter_fn: Callable[[str], str],
     is_image_heavy_pdf_fn: Callable[..., tuple[bool, dict]],
     log_fn: Callable[[str], None],
+    extract_raw_text_fn: Callable[..., str] | None = None,
 ) -> str | None:
     """Extract chairman/board-chair letter from the front matter (first N pages)."""
+    extract_raw_text_fn = extract_raw_text_fn or pdf_extract_text
     is_heavy, st = is_image_heavy_pdf_fn(
         pdf_path,
         sample_pages=min(6, max_pages),
@@ -69,7 +71,7 @@ def extract_chairman_letter(
         return "[CHAIRMAN_LETTER_HINT] 该PDF前部页面图片占比高，董事长致辞正文抽取失败概率大；建议打开原PDF查看。"
 
     try:
-        raw_front = pdfminer_extract_text(pdf_path, page_numbers=list(range(0, max_pages))) or ""
+        raw_front = extract_raw_text_fn(pdf_path, page_numbers=list(range(0, max_pages))) or ""
         front = normalize_for_letter_fn(raw_front)
     except Exception:
         front = ""
@@ -76,16 +76,25 @@ PYTHONPATH=src ./venv/bin/python -m reportclaw.daily_report --no-email --date 20
 - 状态：data/state/last_sent.json
 """
 import argparse
+import concurrent.futures
 import configparser
+from contextlib import ExitStack
 import datetime as dt
+import functools
+import hashlib
 from email.message import EmailMessage
 import smtplib
 import json
 import math
+import mmap
+import os
 import re
+from urllib.parse import quote
 import time
 import zipfile
 import uuid
+from dataclasses import dataclass, field
+from typing import Iterable
 from xml.sax.saxutils import escape
 
 import mysql.connector
@@ -103,8 +112,24 @@ from pathlib import Path
 
 
 from reportclaw.sheet_sync import sync_rows_to_google_sheet
+from reportclaw.state import update_state
+
+try:
+    import connectorx as cx
+    CONNECTORX_AVAILABLE = True
+except Exception:
+    cx = None
+    CONNECTORX_AVAILABLE = False
+
+try:
+    from pypdf import PdfWriter
+    PYPDF_AVAILABLE = True
+except Exception:
+    PdfWriter = None
+    PYPDF_AVAILABLE = False
 
 _SCORE_HIT_CONTEXT_EXPR_CACHE: dict[str, str] = {}
+_MDA_CREATED_AT_INDEX_HINT = "/*+ INDEX(m idx_mda_created_at_report) */"
 
 
 def sync_rows_to_google_sheet_with_retry(cfg, rows, run_date, max_attempts: int = 5, base_sleep: float = 3.0):
@@ -383,6 +408,33 @@ def _latest_daily_pdf_path(run_date: dt.date) -> Path | None:
         return None
     return found[-1]
 
+def _rolling_pdf_path(run_date: dt.date) -> Path:
+    return DAILY_DIR / f"rolling-{run_date:%Y-%m}.pdf"
+
+
+def append_to_rolling_pdf(new_pdf: str | Path, run_date: dt.date, rolling_path: Path | None = None) -> Path | None:
+    """Append the pages of new_pdf to the rolling PDF of run_date's month (DAILY_DIR/rolling-YYYY-MM.pdf).
+
+    pypdf 每次都要把已有的滚动文件整份读入再写出，开销随文件内容增长；按月轮换，
+    单个文件最多一个月的日报，追加开销有上界。已有页面原样拷贝，不经 ReportLab 重新排版。
+    先写临时文件再 os.replace，中途失败不会留下半个滚动文件。
+    """
+    if not PYPDF_AVAILABLE:
+        print("[daily_report][warn] [report] rolling_pdf=true 但未安装 pypdf，跳过滚动汇总")
+        return None
+    rolling_path = rolling_path or _rolling_pdf_path(run_date)
+    rolling_path.parent.mkdir(parents=True, exist_ok=True)
+    writer = PdfWriter()
+    if rolling_path.exists():
+        writer.append(str(rolling_path))
+    writer.append(str(new_pdf))
+    tmp = rolling_path.with_name(rolling_path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        writer.write(f)
+    os.replace(tmp, rolling_path)
+    return rolling_path
+
+
 def _state_path() -> Path:
     STATE_DIR.mkdir(parents=True, exist_ok=True)
     return STATE_DIR / "last_sent.json"
@@ -435,27 +487,14 @@ def load_last_sent_at() -> dt.datetime | None:
 
 def save_last_sent_at(ts: dt.datetime):
     """Save last sent timestamp into shared state file without overwriting other keys."""
-    sp = _state_path()
-    sp.parent.mkdir(parents=True, exist_ok=True)
-
-    obj = {}
-    if sp.exists():
-        try:
-            old = json.loads(sp.read_text(encoding="utf-8"))
-            if isinstance(old, dict):
-                obj.update(old)
-        except Exception:
-            obj = {}
-
     # preferred key (ISO, seconds)
-    obj["last_sent_iso"] = ts.replace(microsecond=0).isoformat()
-
     # 不再写入重复的 legacy 字段 last_sent_at（避免状态文件冗余）。
     # 读取端仍兼容 last_sent_at，方便你历史文件平滑过渡。
-    if "last_sent_at" in obj:
-        obj.pop("last_sent_at", None)
-
-    sp.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    update_state(
+        _state_path(),
+        {"last_sent_iso": ts.replace(microsecond=0).isoformat()},
+        remove=("last_sent_at",),
+    )
 
 
 # --- Helpers for last generated timestamp (防止重复出现在报表) ---
@@ -495,32 +534,103 @@ def load_last_generated_at() -> dt.datetime | None:
 
 def save_last_generated_at(ts: dt.datetime):
     """Save last generated timestamp (ISO) into shared state file without overwriting other keys."""
-    sp = _state_path()
-    sp.parent.mkdir(parents=True, exist_ok=True)
+    update_state(_state_path(), {"last_generated_iso": ts.replace(microsecond=0).isoformat()})
 
-    obj = {}
-    if sp.exists():
-        try:
-            old = json.loads(sp.read_text(encoding="utf-8"))
-            if isinstance(old, dict):
-                obj.update(old)
-        except Exception:
-            obj = {}
 
-    obj["last_generated_iso"] = ts.replace(microsecond=0).isoformat()
+def save_last_run_stats(stats: dict) -> None:
+    """Record a small summary of the last run (rows, outputs, emailed bytes) under last_run_stats.
+
+    仅用于排查/审计：重跑前可对照上次处理了多少行、邮件是否已发出。不参与增量窗口计算。
+    """
+    try:
+        update_state(_state_path(), {"last_run_stats": stats})
+    except Exception as e:
+        print(f"[daily_report][warn] last_run_stats 写入失败（忽略）：{e}")
+
+
+def _ini_bool(v: str) -> bool:
+    return str(v).strip().lower() in ("1", "true", "yes", "y")
+
+
+@dataclass(frozen=True, slots=True)
+class MySQLConfig:
+    """[mysql] 段解析一次后的只读快照（main() 首次连库时构建，后续不再反复查 ConfigParser）。"""
+    host: str
+    port: int
+    user: str
+    password: str = field(repr=False)
+    database: str
+    reader: str
+
+    @classmethod
+    def from_ini(cls, cfg: configparser.ConfigParser) -> "MySQLConfig":
+        if "mysql" not in cfg:
+            raise RuntimeError("config.ini missing [mysql] section")
+        sec = cfg["mysql"]
+        return cls(
+            host=sec.get("host", "127.0.0.1"),
+            port=int(sec.get("port", "3306")),
+            user=sec.get("user", ""),
+            password=sec.get("pass", ""),
+            database=sec.get("db", ""),
+            reader=sec.get("reader", "connector").strip().lower(),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class EmailConfig:
+    """[email] 段中 SMTP 发送用到的字段，解析一次后复用。"""
+    host: str
+    port: int
+    user: str
+    password: str = field(repr=False)
+    from_addr: str
+    use_ssl: bool
+    timeout_sec: float
+    retries: int        # additional retries; total attempts = 1 + retries
+    retry_sleep: float  # base seconds, exponential backoff
+    warn_mb: float
+    attach_epub: bool
+    attach_pdf: bool
+
+    @classmethod
+    def from_ini(cls, cfg: configparser.ConfigParser) -> "EmailConfig":
+        if "email" not in cfg:
+            raise RuntimeError("config.ini missing [email] section")
+        sec = cfg["email"]
+        user = sec.get("user", "")
+        return cls(
+            host=sec.get("host", ""),
+            port=int(sec.get("port", "465")),
+            user=user,
+            password=sec.get("pass", ""),
+            from_addr=sec.get("from", user),
+            use_ssl=_ini_bool(sec.get("use_ssl", "true")),
+            timeout_sec=float(sec.get("timeout", "30")),
+            retries=int(sec.get("retries", "2")),
+            retry_sleep=float(sec.get("retry_sleep", "3")),
+            warn_mb=float(sec.get("warn_mb", "2.0")),
+            attach_epub=_ini_bool(sec.get("attach_epub", "true")),
+            attach_pdf=_ini_bool(sec.get("attach_pdf", "false")),
+        )
 
-    sp.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
 
+def _as_mysql_config(cfg: configparser.ConfigParser | MySQLConfig) -> MySQLConfig:
+    return cfg if isinstance(cfg, MySQLConfig) else MySQLConfig.from_ini(cfg)
 
-def mysql_connect(cfg: configparser.ConfigParser):
-    if "mysql" not in cfg:
-        raise RuntimeError("config.ini missing [mysql] section")
+
+def _as_email_config(cfg: configparser.ConfigParser | EmailConfig) -> EmailConfig:
+    return cfg if isinstance(cfg, EmailConfig) else EmailConfig.from_ini(cfg)
+
+
+def mysql_connect(cfg: configparser.ConfigParser | MySQLConfig):
+    mc = _as_mysql_config(cfg)
     return mysql.connector.connect(
-        host=cfg["mysql"].get("host", "127.0.0.1"),
-        port=int(cfg["mysql"].get("port", "3306")),
-        user=cfg["mysql"].get("user", ""),
-        password=cfg["mysql"].get("pass", ""),
-        database=cfg["mysql"].get("db", ""),
+        host=mc.host,
+        port=mc.port,
+        user=mc.user,
+        password=mc.password,
+        database=mc.database,
     )
 
 
@@ -648,47 +758,107 @@ def _build_score_hits_agg_join_sql(ctx_expr: str) -> str:
     """
 
 
-def _fetch_report_rows(
+def _build_report_rows_sql(
+    ctx_expr: str,
+    *,
+    where_sql: str,
+    order_by_sql: str,
+    include_created_at: bool = False,
+    select_hint_sql: str = "",
+) -> str:
+    created_at_sql = ",\n          m.created_at" if include_created_at else ""
+    score_join_sql = _build_score_hits_agg_join_sql(ctx_expr)
+    return f"""
+    SELECT {select_hint_sql}
+      r.id AS report_id,
+      r.stock_code, r.stock_name, r.report_year, r.publish_date, r.file_path,
+      r.sw_l1_name, r.sw_l2_name, r.sw_l3_name,
+      r.sw_l1_name AS sw_industry1,
+      r.sw_l2_name AS sw_industry2,
+      r.sw_l3_name AS sw_industry3,
+      m.industry_section, m.main_business_section, m.future_section, m.chairman_letter, m.full_mda{created_at_sql},
+      COALESCE(score_agg.score_total, 0) AS score_total,
+      score_agg.score_hits AS score_hits,
+      score_agg.score_hit_details AS score_hit_details
+    FROM annual_reports r
+    JOIN annual_report_mda m ON m.report_id = r.id
+    {score_join_sql}
+    WHERE {where_sql}
+    ORDER BY {order_by_sql}
+    """
+
+
+def _iter_report_rows(
     conn,
     *,
     where_sql: str,
     params: tuple,
     order_by_sql: str,
     include_created_at: bool = False,
+    batch_size: int = 64,
+    select_hint_sql: str = "",
 ):
+    """Yield report rows (dict) lazily from an unbuffered cursor.
+
+    full_mda / main_business_section / future_section 都是大 TEXT 字段；用 buffered cursor + fetchall()
+    会把整个结果集先读进 Python 内存。这里改为 unbuffered cursor + fetchmany(batch_size) 分批读取。
+
+    注意：unbuffered cursor 在结果读完之前不能在同一连接上执行其他查询，所以调用方要先把生成器消费完，
+    再调用 filter_rows_to_globally_latest_reports 等需要再次查库的函数。
+
+    select_hint_sql: 可选的 MySQL optimizer hint（/*+ ... */），紧跟在 SELECT 之后。
+    """
     _ensure_group_concat_max_len(conn)
-    cur = conn.cursor(dictionary=True)
     ctx_expr = _detect_score_hit_context_expr(conn)
-    created_at_sql = ",\n          m.created_at" if include_created_at else ""
-    score_join_sql = _build_score_hits_agg_join_sql(ctx_expr)
+    cur = conn.cursor(dictionary=True, buffered=False)
+    exhausted = False
     try:
         cur.execute(
-            f"""
-            SELECT
-              r.id AS report_id,
-              r.stock_code, r.stock_name, r.report_year, r.publish_date, r.file_path,
-              r.sw_l1_name, r.sw_l2_name, r.sw_l3_name,
-              r.sw_l1_name AS sw_industry1,
-              r.sw_l2_name AS sw_industry2,
-              r.sw_l3_name AS sw_industry3,
-              m.industry_section, m.main_business_section, m.future_section, m.chairman_letter, m.full_mda{created_at_sql},
-              COALESCE(score_agg.score_total, 0) AS score_total,
-              score_agg.score_hits AS score_hits,
-              score_agg.score_hit_details AS score_hit_details
-            FROM annual_reports r
-            JOIN annual_report_mda m ON m.report_id = r.id
-            {score_join_sql}
-            WHERE {where_sql}
-            ORDER BY {order_by_sql}
-            """,
+            _build_report_rows_sql(
+                ctx_expr,
+                where_sql=where_sql,
+                order_by_sql=order_by_sql,
+                include_created_at=include_created_at,
+                select_hint_sql=select_hint_sql,
+            ),
             params,
         )
-        rows = cur.fetchall()
-        return rows or []
+        while True:
+            batch = cur.fetchmany(batch_size)
+            if not batch:
+                exhausted = True
+                break
+            yield from batch
     finally:
+        if not exhausted:
+            # 调用方提前停止迭代：把剩余结果读掉，否则 close() 会报 "Unread result found"
+            try:
+                while cur.fetchmany(batch_size):
+                    pass
+            except Exception:
+                pass
         cur.close()
 
 
+def _fetch_report_rows(
+    conn,
+    *,
+    where_sql: str,
+    params: tuple,
+    order_by_sql: str,
+    include_created_at: bool = False,
+):
+    return list(
+        _iter_report_rows(
+            conn,
+            where_sql=where_sql,
+            params=params,
+            order_by_sql=order_by_sql,
+            include_created_at=include_created_at,
+        )
+    )
+
+
 def _parse_score_hit_detail_rows(r: dict, max_rows: int = 10, dedup: bool = True) -> list[dict]:
     """Parse score_hit_details into deduplicated rows.
 
@@ -752,6 +922,7 @@ def _parse_score_hit_detail_rows(r: dict, max_rows: int = 10, dedup: bool = True
     return items
 
 def fetch_rows_by_publish_date(conn, publish_date: str):
+    # 走 idx_reports_publish_date (publish_date, stock_code)：等值过滤后按 stock_code 顺序读出，无需 filesort
     return _fetch_report_rows(
         conn,
         where_sql="r.publish_date = %s",
@@ -786,19 +957,83 @@ def fetch_rows_by_stock_code(conn, stock_code: str):
         include_created_at=True,
     )
 
-def fetch_rows_by_created_at_range(conn, start_ts: str, end_ts: str):
+def _connectorx_url(cfg: configparser.ConfigParser | MySQLConfig) -> str:
+    mc = _as_mysql_config(cfg)
+    user = quote(mc.user, safe="")
+    password = quote(mc.password, safe="")
+    return f"mysql://{user}:{password}@{mc.host}:{mc.port}/{mc.database}"
+
+
+def _use_connectorx_reader(cfg: configparser.ConfigParser | MySQLConfig | None) -> bool:
+    """[mysql] reader = connectorx 时使用 ConnectorX 批量读取（需额外安装 connectorx + pyarrow）。"""
+    if cfg is None:
+        return False
+    if not isinstance(cfg, MySQLConfig) and "mysql" not in cfg:
+        return False
+    if _as_mysql_config(cfg).reader != "connectorx":
+        return False
+    if not CONNECTORX_AVAILABLE:
+        print("[daily_report][warn] [mysql] reader=connectorx 但未安装 connectorx，回退到 mysql.connector")
+        return False
+    return True
+
+
+def _fetch_rows_by_created_at_range_connectorx(conn, cfg: configparser.ConfigParser | MySQLConfig, start_ts: str, end_ts: str) -> list[dict]:
+    """Read the created_at window with ConnectorX: rows are decoded natively into Arrow, not per row in Python.
+
+    ConnectorX 不支持参数绑定，时间戳先做格式校验再内联；GROUP_CONCAT 长度用 SET_VAR hint 在语句级别放大，
+    因为这里用的是 ConnectorX 自己的连接，无法执行 SET SESSION。
     """
-    Fetch rows where annual_report_mda.created_at is in (start_ts, end_ts] (timestamps as strings 'YYYY-MM-DD HH:MM:SS').
+    for v in (start_ts, end_ts):
+        if not re.fullmatch(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}", v or ""):
+            raise ValueError(f"invalid timestamp for connectorx query: {v!r}")
+
+    ctx_expr = _detect_score_hit_context_expr(conn)
+    sql = _build_report_rows_sql(
+        ctx_expr,
+        where_sql=f"m.created_at > '{start_ts}' AND m.created_at <= '{end_ts}'",
+        order_by_sql="m.created_at DESC, r.stock_code ASC",
+        include_created_at=True,
+        select_hint_sql="/*+ INDEX(m idx_mda_created_at_report) SET_VAR(group_concat_max_len = 1048576) */",
+    )
+    table = cx.read_sql(_connectorx_url(cfg), sql, return_type="arrow")
+    return table.to_pylist()
+
+
+def iter_rows_by_created_at_range(
+    conn,
+    start_ts: str,
+    end_ts: str,
+    cfg: configparser.ConfigParser | MySQLConfig | None = None,
+):
     """
-    return _fetch_report_rows(
+    Lazily yield rows where annual_report_mda.created_at is in (start_ts, end_ts] (timestamps as strings 'YYYY-MM-DD HH:MM:SS').
+
+    cfg: 传入时按 [mysql] reader 选择读取方式；reader=connectorx 时整批读入 Arrow 后再逐行产出。
+    """
+    if _use_connectorx_reader(cfg):
+        try:
+            return iter(_fetch_rows_by_created_at_range_connectorx(conn, cfg, start_ts, end_ts))
+        except Exception as e:
+            print(f"[daily_report][warn] connectorx 读取失败，回退到 mysql.connector: {e}")
+    return _iter_report_rows(
         conn,
         where_sql="m.created_at > %s AND m.created_at <= %s",
         params=(start_ts, end_ts),
         order_by_sql="m.created_at DESC, r.stock_code ASC",
         include_created_at=True,
+        # 让 MySQL 按时间窗口走 idx_mda_created_at_report（见 conf/ddl.sql）；索引不存在时 hint 只会产生 warning
+        select_hint_sql=_MDA_CREATED_AT_INDEX_HINT,
     )
 
 
+def fetch_rows_by_created_at_range(conn, start_ts: str, end_ts: str):
+    """
+    Fetch rows where annual_report_mda.created_at is in (start_ts, end_ts] (timestamps as strings 'YYYY-MM-DD HH:MM:SS').
+    """
+    return list(iter_rows_by_created_at_range(conn, start_ts, end_ts))
+
+
 # --- Helper: sort rows by score DESC, then publish_date DESC, then stock_code ASC ---
 def sort_rows_by_score_desc(rows: list[dict]) -> list[dict]:
     """Sort rows by score_total DESC, then publish_date DESC, then stock_code ASC.
@@ -927,7 +1162,7 @@ def _group_year_label(v) -> str:
     return s if s else "未知年份"
 
 
-def keep_latest_report_per_stock(rows: list[dict]) -> list[dict]:
+def keep_latest_report_per_stock(rows: Iterable[dict]) -> list[dict]:
     """For normal daily/all modes, keep only the latest annual report per stock_code.
 
     Reason:
@@ -940,10 +1175,9 @@ def keep_latest_report_per_stock(rows: list[dict]) -> list[dict]:
       2) publish_date DESC
       3) created_at DESC
       4) report_id DESC
+
+    rows 可以是生成器（iter_rows_by_created_at_range），这里只遍历一次，只保留每只股票的最佳行。
     """
-    rows = list(rows or [])
-    if not rows:
-        return []
 
     def _year(v) -> int:
         try:
@@ -970,7 +1204,7 @@ def keep_latest_report_per_stock(rows: list[dict]) -> list[dict]:
             return dt.datetime.min
 
     best_by_code: dict[str, dict] = {}
-    for r in rows:
+    for r in rows or []:
         code = str(r.get("stock_code") or "").strip()
         if not code:
             continue
@@ -1138,6 +1372,11 @@ def _ensure_chinese_font(styles):
     ReportLab handles TTF reliably; TTC may not work depending on build.
     If no TTF font is found, we fall back to the default font (may render tofu for CJK).
     """
+    # registerFont 修改的是 ReportLab 的全局状态：同一进程里注册过就直接复用
+    if "CNFont" in pdfmetrics.getRegisteredFontNames():
+        styles["Normal"].fontName = "CNFont"
+        return "CNFont"
+
     candidates = [
         "/Library/Fonts/Arial Unicode.ttf",
         "/System/Library/Fonts/Supplemental/Arial Unicode.ttf",
@@ -1159,229 +1398,271 @@ def _ensure_chinese_font(styles):
     return styles["Normal"].fontName
 
 
-# --- New unified text cleaning helper for both PDF and EPUB ---
-def clean_text_for_reading(t: str) -> str:
-    """Common cleaner for both PDF and EPUB rendering.
-
-    Goal: remove header/footer/page numbers and merge artificial hard-wraps introduced by PDF text extraction,
-    while preserving real headings and list item prefixes.
-    """
-    if not t:
-        return t
+# --- Precompiled patterns shared by clean_text_for_reading / safe_block / EPUB ---
+# 标题行（第X节、一、1、（一）等），用于不缩进 + 段落切分
+_HEADING_RE = re.compile(
+    r"^(第[一二三四五六七八九十0-9]{1,3}[节章节]|"
+    r"[一二三四五六七八九十]{1,3}、|"
+    r"\d{1,2}、|"
+    r"[（(][一二三四五六七八九十0-9]{1,3}[）)]|"
+    r"\([一二三四五六七八九十0-9]{1,3}\))"
+)
+_END_PUNCT_CHARS = frozenset("。！？；：:）)」』】")
+_LONG_TOKEN_RE = re.compile(r"[A-Za-z0-9_\\./-]+")
+_WS_SPLIT_RE = re.compile(r"(\s+)")
+# 页眉页脚：与原来的 in / startswith / endswith 判断等价（含长度限制）
+_HEADER_RE = re.compile(
+    r"年度报告.*股份有限公司|股份有限公司.*年度报告|"
+    r"公司代码：|^公司简称：|"
+    r"^.{0,26}有限公司$|"
+    r"^(?=.{0,25}$).*年度报告"
+)
+# 短碎片行判定只看最后一个字符：集合查找代替正则 search
+_SHORT_LINE_TAIL_CHARS = frozenset("。；;：:")
+_ORDINAL_DIGIT_RE = re.compile(r"\d{1,2}")
+_ORDINAL_DIGIT_HEAD_RE = re.compile(r"^\d{1,2}\s*[、\.．:：)]")
+_ORDINAL_CN_RE = re.compile(r"[一二三四五六七八九十]{1,3}")
+_ORDINAL_CN_HEAD_RE = re.compile(r"^[一二三四五六七八九十]{1,3}\s*[、\.．:：)]")
+_ORDINAL_BRACKET_RE = re.compile(r"[（(]\s*(?:\d{1,2}|[一二三四五六七八九十]{1,3})\s*[）)]")
 
-    # 1) Basic normalize
-    raw_lines = str(t).replace("\u00a0", " ").splitlines()
 
-    def is_header_footer(line: str) -> bool:
-        s = (line or "").strip()
-        if not s:
-            return True
-        # pure page number
-        if s.isdigit():
-            return True
-        # x/y page number
-        if "/" in s:
-            parts = [p.strip() for p in s.split("/") if p.strip()]
-            if parts and all(p.isdigit() for p in parts) and len(s) <= 15:
-                return True
-        # common headers
-        if ("年度报告" in s) and ("股份有限公司" in s):
-            return True
-        if s.startswith("公司代码：") or s.startswith("公司简称：") or ("公司代码：" in s):
-            return True
-        if (s.endswith("股份有限公司") or s.endswith("有限公司")) and len(s) <= 30:
-            return True
-        if ("年度报告" in s) and len(s) <= 25:
+# --- New unified text cleaning helper for both PDF and EPUB ---
+def _is_header_footer_line(s: str) -> bool:
+    """Return True for empty lines, page numbers and running headers/footers (s is already stripped)."""
+    if not s:
+        return True
+    # pure page number
+    if s.isdigit():
+        return True
+    # x/y page number
+    if "/" in s:
+        parts = [p.strip() for p in s.split("/") if p.strip()]
+        if parts and all(p.isdigit() for p in parts) and len(s) <= 15:
             return True
-        return False
+    # common headers
+    return _HEADER_RE.search(s) is not None
 
-    tmp: list[str] = []
-    for ln in raw_lines:
-        s = (ln or "").strip()
-        if is_header_footer(s):
-            continue
-        tmp.append(s)
-
-    # 2) Soften very long url/identifier-like tokens so renderers can wrap
-    def soften_long_tokens(line: str) -> str:
-        def _soften_token(tok: str) -> str:
-            if len(tok) < 25:
-                return tok
-            if re.fullmatch(r"[A-Za-z0-9_\\./-]+", tok):
-                step = 20
-                return "\u200b".join(tok[i : i + step] for i in range(0, len(tok), step))
+
+def _soften_long_tokens(line: str) -> str:
+    """Soften very long url/identifier-like tokens so renderers can wrap."""
+    def _soften_token(tok: str) -> str:
+        if len(tok) < 25:
             return tok
+        if _LONG_TOKEN_RE.fullmatch(tok):
+            step = 20
+            return "\u200b".join(tok[i : i + step] for i in range(0, len(tok), step))
+        return tok
 
-        parts = re.split(r"(\s+)", line)
-        for i in range(0, len(parts), 2):
-            parts[i] = _soften_token(parts[i])
-        return "".join(parts)
+    parts = _WS_SPLIT_RE.split(line)
+    for i in range(0, len(parts), 2):
+        parts[i] = _soften_token(parts[i])
+    return "".join(parts)
 
-    tmp = [soften_long_tokens(x) for x in tmp]
 
-    # 3) Merge ultra-short table-like fragments (one word per line)
-    merged: list[str] = []
+def _iter_reading_lines(t: str):
+    """Yield cleaned lines: header/footer filtered, long tokens softened, short fragments merged.
+
+    One pass over the raw lines; only the short-fragment buffer (<= 12 items) is kept.
+    """
     buf: list[str] = []
 
-    def flush_buf():
-        nonlocal buf
-        if buf:
-            merged.append("  ".join(buf).strip())
-            buf = []
+    for ln in str(t).replace("\u00a0", " ").splitlines():
+        s = (ln or "").strip()
+        if _is_header_footer_line(s):
+            continue
+        s = _soften_long_tokens(s)
 
-    for s in tmp:
-        is_short = (len(s) <= 6) and (not re.search(r"[。；;：:]$", s))
+        # Merge ultra-short table-like fragments (one word per line)
+        is_short = len(s) <= 6 and s[-1:] not in _SHORT_LINE_TAIL_CHARS
         if is_short:
             buf.append(s)
             if len(buf) >= 12:
-                flush_buf()
+                yield "  ".join(buf).strip()
+                buf = []
             continue
 
         # Special case: split ordinals like "2" + "新能源"
         if len(buf) == 1:
             token = buf[0].strip()
-            if re.fullmatch(r"\d{1,2}", token):
-                if not re.match(r"^\d{1,2}\s*[、\.．:：)]", s):
-                    merged.append(f"{token}、{s}")
+            if _ORDINAL_DIGIT_RE.fullmatch(token):
+                if not _ORDINAL_DIGIT_HEAD_RE.match(s):
+                    yield f"{token}、{s}"
                     buf = []
                     continue
-            if re.fullmatch(r"[一二三四五六七八九十]{1,3}", token):
-                if not re.match(r"^[一二三四五六七八九十]{1,3}\s*[、\.．:：)]", s):
-                    merged.append(f"{token}、{s}")
+            if _ORDINAL_CN_RE.fullmatch(token):
+                if not _ORDINAL_CN_HEAD_RE.match(s):
+                    yield f"{token}、{s}"
                     buf = []
                     continue
-            if re.fullmatch(r"[（(]\s*(?:\d{1,2}|[一二三四五六七八九十]{1,3})\s*[）)]", token):
-                merged.append(f"{token}{s}")
+            if _ORDINAL_BRACKET_RE.fullmatch(token):
+                yield f"{token}{s}"
                 buf = []
                 continue
 
-        flush_buf()
-        merged.append(s)
+        if buf:
+            yield "  ".join(buf).strip()
+            buf = []
+        yield s
 
-    flush_buf()
+    if buf:
+        yield "  ".join(buf).strip()
 
-    # 4) Reflow: join hard-wrapped lines into paragraphs
-    heading_re = re.compile(
-        r"^(第[一二三四五六七八九十0-9]{1,3}[节章节]|"
-        r"[一二三四五六七八九十]{1,3}、|"
-        r"\d{1,2}、|"
-        r"[（(][一二三四五六七八九十0-9]{1,3}[）)]|"
-        r"\([一二三四五六七八九十0-9]{1,3}\))"
-    )
-    end_punct_re = re.compile(r"[。！？；：:）)」』】]$")
 
-    paras: list[str] = []
-    cur = ""
+def _iter_paragraphs(t: str):
+    """Reflow hard-wrapped lines into paragraphs; headings are followed by one blank separator.
 
-    def flush_cur():
-        nonlocal cur
-        if cur.strip():
-            paras.append(cur.strip())
-        cur = ""
+    Trailing blank separators are never emitted.
+    """
+    cur: list[str] = []
+    cur_last = ""
+    pending_blank = False
 
-    for s in merged:
+    for s in _iter_reading_lines(t):
         s = (s or "").strip()
         if not s:
-            flush_cur()
+            if cur:
+                if pending_blank:
+                    yield ""
+                    pending_blank = False
+                yield "".join(cur)
+                cur = []
             continue
 
-        if heading_re.match(s):
-            flush_cur()
-            paras.append(s)
-            paras.append("")
+        if _HEADING_RE.match(s):
+            if cur:
+                if pending_blank:
+                    yield ""
+                yield "".join(cur)
+                cur = []
+            elif pending_blank:
+                yield ""
+            yield s
+            pending_blank = True
             continue
 
-        if not cur:
-            cur = s
-            continue
+        if cur and cur_last in _END_PUNCT_CHARS:
+            if pending_blank:
+                yield ""
+                pending_blank = False
+            yield "".join(cur)
+            cur = []
+        cur.append(s)
+        cur_last = s[-1]
 
-        if end_punct_re.search(cur):
-            flush_cur()
-            cur = s
-        else:
-            cur += s
+    if cur:
+        if pending_blank:
+            yield ""
+        yield "".join(cur)
 
-    flush_cur()
-    while paras and paras[-1] == "":
-        paras.pop()
 
-    return "\n".join(paras).strip()
+def _clean_text_uncached(t: str) -> str:
+    if not t:
+        return t
+    return "\n".join(_iter_paragraphs(t))
 
 
-def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sort: str = "score", score_only: bool = False, single_stock_mode: bool = False) -> str:
-    def _build_score_detail_blocks(r: dict, max_rows: int = 10):
-        """Build split-friendly flowables for score hit details.
+# 清洗是确定性的：同一段原文在 PDF / EPUB / 多个附件里会被反复清洗，按 sha1(原文) 记住结果。
+# 只存摘要不存原文，避免缓存本身把大段 MDA 文本多留一份。
+_CLEAN_TEXT_CACHE: dict[str, str] = {}
+_CLEAN_TEXT_CACHE_MAX = 2048
 
-        Do NOT use a Table here: a single very long context inside one table cell cannot split
-        across pages and may raise ReportLab LayoutError.
-        """
-        detail_rows = _parse_score_hit_detail_rows(r, max_rows=max_rows, dedup=True)
-        if not detail_rows:
-            return []
 
-        blocks = [Paragraph("关键词命中明细", section_header), Spacer(1, 1.5 * mm)]
-        for idx, item in enumerate(detail_rows, start=1):
-            kw = item["keyword"]
-            pts = int(item["points"])
-            ctx = item["context"]
-            sign = "+" if pts > 0 else ""
-            left = f"{idx}. {kw}({sign}{pts})"
+def _clean_text_cache_key(t: str) -> str:
+    return hashlib.sha1(t.encode("utf-8", "surrogatepass")).hexdigest()
 
-            blocks.append(Paragraph(escape(left), pre))
-            blocks.append(Paragraph(escape(ctx) if ctx else "（无原文）", body))
-            if idx < len(detail_rows):
-                blocks.append(Spacer(1, 1.2 * mm))
-                blocks.append(Paragraph("────────", stock_footer))
-                blocks.append(Spacer(1, 1.2 * mm))
 
-        blocks.append(Spacer(1, 2 * mm))
-        return blocks
+def _remember_clean_text(key: str, cleaned: str) -> None:
+    if len(_CLEAN_TEXT_CACHE) >= _CLEAN_TEXT_CACHE_MAX:
+        _CLEAN_TEXT_CACHE.pop(next(iter(_CLEAN_TEXT_CACHE)))
+    _CLEAN_TEXT_CACHE[key] = cleaned
+
+
+def clean_text_for_reading(t: str) -> str:
+    """Common cleaner for both PDF and EPUB rendering.
+
+    Goal: remove header/footer/page numbers and merge artificial hard-wraps introduced by PDF text extraction,
+    while preserving real headings and list item prefixes.
     """
-    将 rows（DB 查询结果）渲染为汇总 PDF。
+    if not t:
+        return t
+    key = _clean_text_cache_key(t)
+    cleaned = _CLEAN_TEXT_CACHE.get(key)
+    if cleaned is None:
+        cleaned = _clean_text_uncached(t)
+        _remember_clean_text(key, cleaned)
+    return cleaned
 
-    rows: list[dict]，字段包含：
-      - stock_code/stock_name/report_year/publish_date/file_path
-      - main_business_section（管理层综述摘录）
-      - future_section（未来展望摘录，可为空）
-      - created_at（用于展示与增量范围说明）
 
-    版式策略（面向可读性）
-    - 清理页眉页脚/页码
-    - 合并短行（表格抽取污染）
-    - 软断行超长 token（避免右侧溢出）
-    - 重新排版为自然段 + 小标题分隔
-    - 段首缩进（HTML 全角空格实体）
+# PDF 正文首行缩进：两个全角空格（Paragraph 会折叠普通行首空白）
+_PARA_INDENT_HTML = "&#12288;&#12288;"
+
+# 每只股票都会重复的静态文本片段（分隔线、结束标记）。
+# Flowable 实例本身不跨位置复用：ReportLab 排版时会往实例上写状态（wrap 结果、_frame、_postponed 等），
+# 同一对象出现在 story 多处时，跨页拆分 / LayoutError 重排会互相干扰。
+_RULE_LONG = "─" * 32
+_RULE_SHORT = "─" * 8
+_END_MARK = "###########**end****############"
+
+# 少量文本时进程池的启动/序列化开销大于收益，直接串行
+_PARALLEL_CLEAN_MIN_TEXTS = 16
+
+
+def _clean_texts_parallel(texts: list[str | None]) -> list[str | None]:
+    """Run clean_text_for_reading over texts, in a process pool when there are enough of them.
+
+    Order is preserved; falls back to serial cleaning if the pool cannot be used.
+    Texts already in the clean-text cache are not sent to the pool.
+    结果按 key 从本地 dict 取；缓存只是旁路存储，批量超过 _CLEAN_TEXT_CACHE_MAX 时
+    早先的结果被淘汰也不会在主进程里重新清洗一遍。
     """
+    keys = [_clean_text_cache_key(t) if t else None for t in texts]
+    cleaned_by_key: dict[str, str] = {}
+    misses: dict[str, str] = {}
+    for k, t in zip(keys, texts):
+        if k is None or k in cleaned_by_key or k in misses:
+            continue
+        cached = _CLEAN_TEXT_CACHE.get(k)
+        if cached is not None:
+            cleaned_by_key[k] = cached
+        else:
+            misses[k] = t
+
+    if len(misses) >= _PARALLEL_CLEAN_MIN_TEXTS:
+        workers = min(os.cpu_count() or 1, len(misses))
+        try:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                for k, cleaned in zip(misses, pool.map(_clean_text_uncached, misses.values(), chunksize=4)):
+                    cleaned_by_key[k] = cleaned
+        except Exception as e:
+            print(f"[perf] parallel text cleaning unavailable, falling back to serial: {e}")
+
+    for k, t in misses.items():
+        cleaned = cleaned_by_key.get(k)
+        if cleaned is None:
+            cleaned = cleaned_by_key[k] = _clean_text_uncached(t)
+        _remember_clean_text(k, cleaned)
+
+    return [cleaned_by_key[k] if k is not None else t for k, t in zip(keys, texts)]
+
+
+@dataclass(frozen=True)
+class _PdfStyles:
+    base_font: str
+    h1: ParagraphStyle
+    stock_header: ParagraphStyle
+    stock_footer: ParagraphStyle
+    score_line: ParagraphStyle
+    industry_line: ParagraphStyle
+    section_header: ParagraphStyle
+    body: ParagraphStyle
+    pre: ParagraphStyle
+
+
+@functools.lru_cache(maxsize=1)
+def _get_pdf_styles() -> _PdfStyles:
+    """Register the CJK font and build the PDF paragraph styles once per process."""
     styles = getSampleStyleSheet()
     base_font = _ensure_chinese_font(styles)
-    # Load scoring rules from conf/scoring_keywords.json or config.ini [scoring]
-    # Note: PDF generator does not receive cfg, so it reads the JSON file (preferred).
-    good_rules, bad_rules = _load_scoring_rules(configparser.ConfigParser())
-
-    # --- Cover page drawing helper (blue sky + clouds + title) ---
-    def _draw_cover(canvas, doc_obj):
-        """Draw a simple cover (blue sky + white clouds) and the title on the first page."""
-        canvas.saveState()
-        w, h = A4
-        # sky background
-        canvas.setFillColorRGB(0.52, 0.78, 0.95)
-        canvas.rect(0, 0, w, h, fill=1, stroke=0)
-        # clouds (simple circles)
-        canvas.setFillColorRGB(1, 1, 1)
-        for (cx, cy, r) in [
-            (w*0.25, h*0.78, 26), (w*0.30, h*0.79, 34), (w*0.36, h*0.78, 28),
-            (w*0.65, h*0.70, 30), (w*0.71, h*0.71, 38), (w*0.78, h*0.70, 30),
-        ]:
-            canvas.circle(cx, cy, r, fill=1, stroke=0)
-        # title
-        canvas.setFillColorRGB(0, 0, 0)
-        canvas.setFont(base_font, 22)
-        canvas.drawCentredString(w/2, h*0.52, f"年报摘录汇总")
-        canvas.setFont(base_font, 14)
-        canvas.drawCentredString(w/2, h*0.48, f"{title_date}")
-        canvas.setFont(base_font, 11)
-        canvas.drawCentredString(w/2, h*0.10, "ReportClaw")
-        canvas.restoreState()
 
     h1 = ParagraphStyle(
         name="H1",
@@ -1430,16 +1711,6 @@ def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sor
         spaceBefore=0,
         spaceAfter=6,
     )
-    def format_industry_line(r: dict) -> str:
-        inds = []
-        for k in ("sw_l1_name", "sw_l2_name", "sw_l3_name"):
-            v = r.get(k)
-            s = str(v).strip() if v is not None else ""
-            if s:
-                inds.append(s)
-        if not inds:
-            return "申万行业：未获取"
-        return "申万行业：" + " / ".join(inds)
     section_header = ParagraphStyle(
         name="SectionHeader",
         parent=styles["Heading3"],
@@ -1472,17 +1743,131 @@ def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sor
         allowWidows=1,
     )
 
+    return _PdfStyles(
+        base_font=base_font,
+        h1=h1,
+        stock_header=stock_header,
+        stock_footer=stock_footer,
+        score_line=score_line,
+        industry_line=industry_line,
+        section_header=section_header,
+        body=body,
+        pre=pre,
+    )
+
+
+def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sort: str = "score", score_only: bool = False, single_stock_mode: bool = False) -> str:
+    """
+    将 rows（DB 查询结果）渲染为汇总 PDF。
+
+    rows: list[dict]，字段包含：
+      - stock_code/stock_name/report_year/publish_date/file_path
+      - main_business_section（管理层综述摘录）
+      - future_section（未来展望摘录，可为空）
+      - created_at（用于展示与增量范围说明）
+
+    版式策略（面向可读性）
+    - 清理页眉页脚/页码
+    - 合并短行（表格抽取污染）
+    - 软断行超长 token（避免右侧溢出）
+    - 重新排版为自然段 + 小标题分隔
+    - 段首缩进（HTML 全角空格实体）
+    """
+    pdf_styles = _get_pdf_styles()
+    base_font = pdf_styles.base_font
+    h1 = pdf_styles.h1
+    stock_header = pdf_styles.stock_header
+    stock_footer = pdf_styles.stock_footer
+    score_line = pdf_styles.score_line
+    industry_line = pdf_styles.industry_line
+    section_header = pdf_styles.section_header
+    body = pdf_styles.body
+    pre = pdf_styles.pre
+
+    def _rule_block(rule: str, space_before: float, space_after: float) -> list:
+        return [Spacer(1, space_before), Paragraph(rule, stock_footer), Spacer(1, space_after)]
+
+    def _build_score_detail_blocks(r: dict, max_rows: int = 10):
+        """Build split-friendly flowables for score hit details.
+
+        Do NOT use a Table here: a single very long context inside one table cell cannot split
+        across pages and may raise ReportLab LayoutError.
+        """
+        detail_rows = _parse_score_hit_detail_rows(r, max_rows=max_rows, dedup=True)
+        if not detail_rows:
+            return []
+
+        blocks = [Paragraph("关键词命中明细", section_header), Spacer(1, 1.5 * mm)]
+        for idx, item in enumerate(detail_rows, start=1):
+            kw = item["keyword"]
+            pts = int(item["points"])
+            ctx = item["context"]
+            sign = "+" if pts > 0 else ""
+            left = f"{idx}. {kw}({sign}{pts})"
+
+            blocks.append(Paragraph(escape(left), pre))
+            blocks.append(Paragraph(escape(ctx) if ctx else "（无原文）", body))
+            if idx < len(detail_rows):
+                blocks.extend(_rule_block(_RULE_SHORT, 1.2 * mm, 1.2 * mm))
+
+        blocks.append(Spacer(1, 2 * mm))
+        return blocks
+
+    # Load scoring rules from conf/scoring_keywords.json or config.ini [scoring]
+    # Note: PDF generator does not receive cfg, so it reads the JSON file (preferred).
+    good_rules, bad_rules = _load_scoring_rules(configparser.ConfigParser())
+
+    # --- Cover page drawing helper (blue sky + clouds + title) ---
+    def _draw_cover(canvas, doc_obj):
+        """Draw a simple cover (blue sky + white clouds) and the title on the first page."""
+        canvas.saveState()
+        w, h = A4
+        # sky background
+        canvas.setFillColorRGB(0.52, 0.78, 0.95)
+        canvas.rect(0, 0, w, h, fill=1, stroke=0)
+        # clouds (simple circles)
+        canvas.setFillColorRGB(1, 1, 1)
+        for (cx, cy, r) in [
+            (w*0.25, h*0.78, 26), (w*0.30, h*0.79, 34), (w*0.36, h*0.78, 28),
+            (w*0.65, h*0.70, 30), (w*0.71, h*0.71, 38), (w*0.78, h*0.70, 30),
+        ]:
+            canvas.circle(cx, cy, r, fill=1, stroke=0)
+        # title
+        canvas.setFillColorRGB(0, 0, 0)
+        canvas.setFont(base_font, 22)
+        canvas.drawCentredString(w/2, h*0.52, f"年报摘录汇总")
+        canvas.setFont(base_font, 14)
+        canvas.drawCentredString(w/2, h*0.48, f"{title_date}")
+        canvas.setFont(base_font, 11)
+        canvas.drawCentredString(w/2, h*0.10, "ReportClaw")
+        canvas.restoreState()
+
+    def format_industry_line(r: dict) -> str:
+        inds = []
+        for k in ("sw_l1_name", "sw_l2_name", "sw_l3_name"):
+            v = r.get(k)
+            s = str(v).strip() if v is not None else ""
+            if s:
+                inds.append(s)
+        if not inds:
+            return "申万行业：未获取"
+        return "申万行业：" + " / ".join(inds)
+
     Path(out_path).parent.mkdir(parents=True, exist_ok=True)
 
-    doc = SimpleDocTemplate(
-        out_path,
-        pagesize=A4,
-        leftMargin=18 * mm,
-        rightMargin=18 * mm,
-        topMargin=16 * mm,
-        bottomMargin=16 * mm,
-        title=f"年报摘录汇总 {title_date}",
-    )
+    def _build_pdf(story: list) -> None:
+        # 直接写入已打开的文件句柄；doc.build 会边排版边从 story 里弹出已绘制的 flowable
+        with open(out_path, "wb") as fh:
+            doc = SimpleDocTemplate(
+                fh,
+                pagesize=A4,
+                leftMargin=18 * mm,
+                rightMargin=18 * mm,
+                topMargin=16 * mm,
+                bottomMargin=16 * mm,
+                title=f"年报摘录汇总 {title_date}",
+            )
+            doc.build(story, onFirstPage=_draw_cover)
 
     story = []
 
@@ -1510,6 +1895,8 @@ def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sor
 
     score_row_keys = {_row_nav_key(r) for r in score_rows}
     summary_row_keys = {_row_nav_key(r) for r in summary_rows}
+    # 锚点名带上文件名前缀：多份日报拼进同一个滚动 PDF 时，命名目标不会互相覆盖
+    anchor_ns = re.sub(r"[^0-9A-Za-z]+", "_", Path(out_path).stem).strip("_") or "doc"
 
     # Cover page placeholder
     story.append(Spacer(1, 260 * mm))
@@ -1543,40 +1930,27 @@ def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sor
             t = t[:max_chars] + "\n...（内容过长已截断）"
         return t
 
-    def safe_block(text: str):
+    def safe_block(text: str | None, cleaned: str | None = None):
         if not text:
             return Paragraph("（未提取到内容）", body)
 
-        cleaned = clean_text_for_reading(text)
-
-        # Paragraph 会折叠行首空白，因此用 HTML 实体来做“首行缩进”
-        heading_re = re.compile(
-            r"^(第[一二三四五六七八九十0-9]{1,3}[节章节]|"
-            r"[一二三四五六七八九十]{1,3}、|"
-            r"\d{1,2}、|"
-            r"[（(][一二三四五六七八九十0-9]{1,3}[）)]|"
-            r"\([一二三四五六七八九十0-9]{1,3}\))"
-        )
-
-        lines = cleaned.split("\n")
-        html_lines = []
-        indent = "&#12288;&#12288;"  # 两个全角空格
-        for ln in lines:
-            s = ln.strip()
-            if not s:
-                html_lines.append("")
-                continue
-            esc = escape(s)
-            if heading_re.match(s):
-                html_lines.append(esc)
-            else:
-                html_lines.append(indent + esc)
+        if cleaned is None:
+            cleaned = clean_text_for_reading(text)
 
-        html = "<br/>".join(html_lines)
+        # Paragraph 会折叠行首空白，因此用 HTML 实体来做“首行缩进”。
+        # 空行保留为 ""：join 后形成连续 <br/>，即段落之间的空行。
+        html = "<br/>".join([
+            ("" if not s else escape(s) if _HEADING_RE.match(s) else _PARA_INDENT_HTML + escape(s))
+            for s in (ln.strip() for ln in cleaned.split("\n"))
+        ])
         return Paragraph(html, body)
 
     last_score_year = None
-    for i, r in enumerate(score_rows):
+    prev_score_row = None
+    for r in score_rows:
+        if prev_score_row is not None:
+            story.append(Spacer(1, 2 * mm))
+        prev_score_row = r
         cur_score_year = _group_year_label(r.get("report_year"))
         if cur_score_year != last_score_year:
             story.append(Paragraph(f"{cur_score_year}年", section_header))
@@ -1608,8 +1982,8 @@ def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sor
             header += " | PARSE_FAILED"
 
         nav_key = _row_nav_key(r)
-        score_anchor = f"score_{nav_key}"
-        summary_anchor = f"summary_{nav_key}"
+        score_anchor = f"{anchor_ns}_score_{nav_key}"
+        summary_anchor = f"{anchor_ns}_summary_{nav_key}"
 
         story.append(Paragraph(f'<a name="{score_anchor}"/>{escape(header)}', stock_header))
         story.append(Paragraph(escape(format_industry_line(r)), industry_line))
@@ -1637,17 +2011,13 @@ def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sor
         detail_blocks = _build_score_detail_blocks(r, max_rows=10)
         if detail_blocks:
             story.extend(detail_blocks)
-        story.append(Spacer(1, 3 * mm))
-        story.append(Paragraph("────────────────────────────────", stock_footer))
-        story.append(Spacer(1, 4 * mm))
+        story.extend(_rule_block(_RULE_LONG, 3 * mm, 4 * mm))
 
         # 1) 董事长致辞 / 致股东(投资者)信（如果有）
         # (removed for score section)
-        if i < len(score_rows) - 1:
-            story.append(Spacer(1, 2 * mm))
 
     if score_only:
-        doc.build(story, onFirstPage=_draw_cover)
+        _build_pdf(story)
         return out_path
 
     if score_rows:
@@ -1659,14 +2029,14 @@ def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sor
     story.append(Paragraph(summary_title, h1))
     story.append(Spacer(1, 6 * mm))
 
-    last_summary_year = None
-    for i, r in enumerate(summary_rows):
-        if single_stock_mode:
-            cur_summary_year = _group_year_label(r.get("report_year"))
-            if cur_summary_year != last_summary_year:
-                story.append(Paragraph(f"{cur_summary_year}年", section_header))
-                story.append(Spacer(1, 2 * mm))
-                last_summary_year = cur_summary_year
+    def _summary_fragment(r: dict, texts: tuple, cleaned: tuple) -> list:
+        """Build the flowables for one ticker's summary block.
+
+        texts / cleaned: (chairman, main_business, future) raw and pre-cleaned section text.
+        """
+        chairman_text, main_text, future_text = texts
+        chairman_clean, main_clean, future_clean = cleaned
+        frag: list = []
         file_path = r.get("file_path", "") or ""
         pdf_name = ""
         try:
@@ -1691,43 +2061,65 @@ def generate_daily_summary_pdf(rows, out_path: str, title_date: str, summary_sor
             header += " | PARSE_FAILED"
 
         nav_key = _row_nav_key(r)
-        score_anchor = f"score_{nav_key}"
-        summary_anchor = f"summary_{nav_key}"
+        score_anchor = f"{anchor_ns}_score_{nav_key}"
+        summary_anchor = f"{anchor_ns}_summary_{nav_key}"
 
-        story.append(Paragraph(f'<a name="{summary_anchor}"/>{escape(header)}', stock_header))
-        story.append(Paragraph(escape(format_industry_line(r)), industry_line))
+        frag.append(Paragraph(f'<a name="{summary_anchor}"/>{escape(header)}', stock_header))
+        frag.append(Paragraph(escape(format_industry_line(r)), industry_line))
         if nav_key in score_row_keys:
-            story.append(Paragraph(f'<a href="#{score_anchor}">返回评分部分</a>', score_line))
+            frag.append(Paragraph(f'<a href="#{score_anchor}">返回评分部分</a>', score_line))
 
         def add_divider():
-            story.append(Spacer(1, 2 * mm))
-            story.append(Paragraph("────────────────────────────────", stock_footer))
-            story.append(Spacer(1, 3 * mm))
+            frag.extend(_rule_block(_RULE_LONG, 2 * mm, 3 * mm))
 
-        chairman = r.get("chairman_letter")
-        has_chairman = chairman and str(chairman).strip()
-        if has_chairman:
-            story.append(Paragraph("董事长致辞 / 致股东(投资者)信", section_header))
-            story.append(safe_block(str(chairman)))
+        if chairman_text:
+            frag.append(Paragraph("董事长致辞 / 致股东(投资者)信", section_header))
+            frag.append(safe_block(chairman_text, chairman_clean))
             add_divider()
 
-        story.append(Paragraph("管理层综述（摘录）", section_header))
-        story.append(safe_block(pick_section_text(r.get("main_business_section"), full_mda)))
+        frag.append(Paragraph("管理层综述（摘录）", section_header))
+        frag.append(safe_block(main_text, main_clean))
 
         add_divider()
-        story.append(Paragraph("未来展望（摘录）", section_header))
-        story.append(safe_block(pick_section_text(r.get("future_section"), "")))
+        frag.append(Paragraph("未来展望（摘录）", section_header))
+        frag.append(safe_block(future_text, future_clean))
         end_mark = header
-        story.append(Spacer(1, 3 * mm))
-        story.append(Paragraph(end_mark, stock_footer))
-        story.append(Spacer(1, 2 * mm))
-        story.append(Paragraph("###########**end****############", stock_footer))
-        story.append(Spacer(1, 4 * mm))
+        frag.append(Spacer(1, 3 * mm))
+        frag.append(Paragraph(end_mark, stock_footer))
+        frag.append(Spacer(1, 2 * mm))
+        frag.append(Paragraph(_END_MARK, stock_footer))
+        frag.append(Spacer(1, 4 * mm))
+        return frag
+
+    # 文本清洗是纯 CPU 的正则处理，各股票之间互不依赖：先（按需并行）统一清洗，再在主线程按顺序排版
+    summary_texts: list[tuple] = []
+    for r in summary_rows:
+        chairman = r.get("chairman_letter")
+        summary_texts.append((
+            str(chairman) if chairman and str(chairman).strip() else None,
+            pick_section_text(r.get("main_business_section"), r.get("full_mda") or ""),
+            pick_section_text(r.get("future_section"), ""),
+        ))
+    flat_cleaned = _clean_texts_parallel([t for texts in summary_texts for t in texts])
+    summary_cleaned = [tuple(flat_cleaned[i:i + 3]) for i in range(0, len(flat_cleaned), 3)]
+    del flat_cleaned
 
-        if i < len(summary_rows) - 1:
+    last_summary_year = None
+    prev_summary_row = None
+    for r, texts, cleaned in zip(summary_rows, summary_texts, summary_cleaned):
+        if prev_summary_row is not None:
             story.append(PageBreak())
+        prev_summary_row = r
+        if single_stock_mode:
+            cur_summary_year = _group_year_label(r.get("report_year"))
+            if cur_summary_year != last_summary_year:
+                story.append(Paragraph(f"{cur_summary_year}年", section_header))
+                story.append(Spacer(1, 2 * mm))
+                last_summary_year = cur_summary_year
+        # 每只股票单独构建一个小片段再并入 story，片段里的中间文本随函数返回即释放
+        story.extend(_summary_fragment(r, texts, cleaned))
 
-    doc.build(story, onFirstPage=_draw_cover)
+    _build_pdf(story)
     return out_path
 
 
@@ -1768,14 +2160,6 @@ def _text_to_xhtml_paras(t: str) -> str:
     t = clean_text_for_reading(t)
     t = t.replace("\r\n", "\n").replace("\r", "\n")
 
-    heading_re = re.compile(
-        r"^(第[一二三四五六七八九十0-9]{1,3}[节章节]|"
-        r"[一二三四五六七八九十]{1,3}、|"
-        r"\d{1,2}、|"
-        r"[（(][一二三四五六七八九十0-9]{1,3}[）)]|"
-        r"\([一二三四五六七八九十0-9]{1,3}\))"
-    )
-
     out: list[str] = []
     blank_run = 0
 
@@ -1788,7 +2172,7 @@ def _text_to_xhtml_paras(t: str) -> str:
 
         blank_run = 0
         inner = _escape_xhtml(s)
-        if heading_re.match(s):
+        if _HEADING_RE.match(s):
             out.append(f"<p class=\"noindent\">{inner}</p>")
         else:
             out.append(f"<p>{inner}</p>")
@@ -2241,39 +2625,55 @@ def generate_daily_summary_epub(rows, out_path: str, title_date: str, summary_so
     return str(out_p)
 
 
-def send_email_with_attachment_smtp(cfg: configparser.ConfigParser, to_addr: str, subject: str, body: str, attachment_path: str, epub_path: str | None = None):
+def _map_attachment(stack: ExitStack, p: Path) -> bytes | memoryview:
+    """Map an attachment read-only; the view stays valid until `stack` closes.
+
+    空文件无法 mmap，直接返回 b""。
+    """
+    with open(p, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        mm = stack.enter_context(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    return stack.enter_context(memoryview(mm))
+
+
+def send_email_with_attachment_smtp(
+    cfg: configparser.ConfigParser | EmailConfig,
+    to_addr: str,
+    subject: str,
+    body: str,
+    attachment_path: str,
+    epub_path: str | None = None,
+):
     """
     通过 SMTP 发送带附件的邮件。
 
     注意
-    - cfg 来自 conf/config.ini 的 [email] 段
+    - cfg 来自 conf/config.ini 的 [email] 段（EmailConfig，或原始 ConfigParser）
     - to_addr 可为逗号分隔的多个收件人
     - use_ssl=true 使用 SMTP_SSL；否则使用 STARTTLS（仅当服务器支持 starttls）
     - 默认仅发送 EPUB；如需同时发送 PDF，请在 [email] 配置 attach_pdf=true
     """
-    if "email" not in cfg:
-        raise RuntimeError("config.ini missing [email] section")
-
-    host = cfg["email"].get("host", "")
-    port = int(cfg["email"].get("port", "465"))
-    user = cfg["email"].get("user", "")
-    password = cfg["email"].get("pass", "")
-    from_addr = cfg["email"].get("from", user)
-    use_ssl = cfg["email"].get("use_ssl", "true").lower() in ("1", "true", "yes", "y")
-    timeout_sec = float(cfg["email"].get("timeout", "30"))
+    ec = _as_email_config(cfg)
+    host = ec.host
+    port = ec.port
+    user = ec.user
+    password = ec.password
+    from_addr = ec.from_addr
+    use_ssl = ec.use_ssl
+    timeout_sec = ec.timeout_sec
 
     # Retry + hint controls
-    retries = int(cfg["email"].get("retries", "2"))          # additional retries; total attempts = 1 + retries
-    retry_sleep = float(cfg["email"].get("retry_sleep", "3")) # base seconds, exponential backoff
-    warn_mb = float(cfg["email"].get("warn_mb", "2.0"))
-    attach_epub = cfg["email"].get("attach_epub", "true").lower() in ("1", "true", "yes", "y")
-    attach_pdf = cfg["email"].get("attach_pdf", "false").lower() in ("1", "true", "yes", "y")
+    retries = ec.retries
+    retry_sleep = ec.retry_sleep
+    warn_mb = ec.warn_mb
+    attach_epub = ec.attach_epub
+    attach_pdf = ec.attach_pdf
 
     if not host or not user or not password or not from_addr:
         raise RuntimeError("email config incomplete: need host/user/pass/from")
 
     ap = Path(attachment_path)
-    pdf_bytes: bytes | None = None
 
     # Optional EPUB attachment
     epub_p: Path | None = None
@@ -2288,103 +2688,106 @@ def send_email_with_attachment_smtp(cfg: configparser.ConfigParser, to_addr: str
         except Exception:
             epub_p = None
 
-    attachments: list[tuple[str, bytes, str, str]] = []
-    if attach_epub and epub_p is not None:
-        attachments.append((epub_p.name, epub_p.read_bytes(), "application", "epub+zip"))
-    if attach_pdf:
-        pdf_bytes = ap.read_bytes()
-        attachments.append((ap.name, pdf_bytes, "application", "pdf"))
-
-    # Diagnostics
-    print(f"[email] smtp={host}:{port} ssl={use_ssl} timeout={timeout_sec}s to={to_addr}")
-    total_mb = 0.0
-    if attachments:
-        attach_desc = []
-        for filename, payload, _maintype, subtype in attachments:
-            size_mb = len(payload) / (1024 * 1024)
-            total_mb += size_mb
-            attach_desc.append(f"{filename} size={size_mb:.2f}MB type={subtype}")
-        print(f"[email] attach: {' + '.join(attach_desc)}")
-    else:
-        print("[email] attach: none (text-only)")
-
-    if total_mb >= warn_mb:
-        print(
-            f"[email][warn] 附件较大（总计 {total_mb:.2f}MB），可能在发送 DATA 阶段超时。"
-            f"建议：email.timeout=180~300，或减少日报内容/标的数量。"
-        )
+    # 附件用只读 mmap 交给 EmailMessage：不再先 read_bytes() 复制一份完整 bytes，
+    # base64 编码按行切片直接读映射页；stack 退出时释放 memoryview 并关闭映射。
+    with ExitStack() as stack:
+        attachments: list[tuple[str, bytes | memoryview, str, str]] = []
+        if attach_epub and epub_p is not None:
+            attachments.append((epub_p.name, _map_attachment(stack, epub_p), "application", "epub+zip"))
+        if attach_pdf:
+            attachments.append((ap.name, _map_attachment(stack, ap), "application", "pdf"))
+
+        # Diagnostics
+        print(f"[email] smtp={host}:{port} ssl={use_ssl} timeout={timeout_sec}s to={to_addr}")
+        total_mb = 0.0
+        if attachments:
+            attach_desc = []
+            for filename, payload, _maintype, subtype in attachments:
+                size_mb = len(payload) / (1024 * 1024)
+                total_mb += size_mb
+                attach_desc.append(f"{filename} size={size_mb:.2f}MB type={subtype}")
+            print(f"[email] attach: {' + '.join(attach_desc)}")
+        else:
+            print("[email] attach: none (text-only)")
 
-    recipients = [x.strip() for x in re.split(r"[;,]", to_addr) if x.strip()]
-    if not recipients:
-        raise RuntimeError("email recipients empty after parsing 'to'")
-
-    def _build_message() -> EmailMessage:
-        msg = EmailMessage()
-        msg["From"] = from_addr
-        msg["To"] = ", ".join(recipients)
-        msg["Subject"] = subject
-        msg.set_content(body)
-        for filename, payload, maintype, subtype in attachments:
-            msg.add_attachment(
-                payload,
-                maintype=maintype,
-                subtype=subtype,
-                filename=filename,
+        if total_mb >= warn_mb:
+            print(
+                f"[email][warn] 附件较大（总计 {total_mb:.2f}MB），可能在发送 DATA 阶段超时。"
+                f"建议：email.timeout=180~300，或减少日报内容/标的数量。"
             )
-        return msg
 
-    last_err = None
-
-    for attempt in range(1, retries + 2):
-        try:
-            msg = _build_message()
-            if use_ssl:
-                with smtplib.SMTP_SSL(host, port, timeout=timeout_sec) as s:
-                    s.ehlo()
-                    s.login(user, password)
-                    s.noop()
-                    s.sendmail(from_addr, recipients, msg.as_bytes())
-            else:
-                with smtplib.SMTP(host, port, timeout=timeout_sec) as s:
-                    s.ehlo()
-                    # Only starttls if server supports it; some providers do not.
-                    if s.has_extn("starttls"):
-                        s.starttls()
+        recipients = [x.strip() for x in re.split(r"[;,]", to_addr) if x.strip()]
+        if not recipients:
+            raise RuntimeError("email recipients empty after parsing 'to'")
+
+        def _build_message() -> EmailMessage:
+            msg = EmailMessage()
+            msg["From"] = from_addr
+            msg["To"] = ", ".join(recipients)
+            msg["Subject"] = subject
+            msg.set_content(body)
+            for filename, payload, maintype, subtype in attachments:
+                msg.add_attachment(
+                    payload,
+                    maintype=maintype,
+                    subtype=subtype,
+                    filename=filename,
+                    cte="base64",
+                )
+            return msg
+
+        last_err = None
+
+        for attempt in range(1, retries + 2):
+            try:
+                msg = _build_message()
+                if use_ssl:
+                    with smtplib.SMTP_SSL(host, port, timeout=timeout_sec) as s:
                         s.ehlo()
-                    else:
-                        raise RuntimeError(
-                            f"SMTP 服务器未宣告 STARTTLS（{host}:{port}）。"
-                            f"若是新浪邮箱，通常请使用 465 + SSL（use_ssl=true）。"
-                        )
-                    s.login(user, password)
-                    s.noop()
-                    s.sendmail(from_addr, recipients, msg.as_bytes())
-
-            if attempt > 1:
-                print(f"[email] send succeeded on attempt {attempt}")
-            return
-
-        except smtplib.SMTPAuthenticationError as e:
-            raise RuntimeError(
-                "SMTP 认证失败：请确认账号/授权码无误（很多邮箱需要“客户端授权码/应用专用密码”），并确认已开启 SMTP。"
-                f"原始错误: {e}"
-            ) from e
+                        s.login(user, password)
+                        s.noop()
+                        s.sendmail(from_addr, recipients, msg.as_bytes())
+                else:
+                    with smtplib.SMTP(host, port, timeout=timeout_sec) as s:
+                        s.ehlo()
+                        # Only starttls if server supports it; some providers do not.
+                        if s.has_extn("starttls"):
+                            s.starttls()
+                            s.ehlo()
+                        else:
+                            raise RuntimeError(
+                                f"SMTP 服务器未宣告 STARTTLS（{host}:{port}）。"
+                                f"若是新浪邮箱，通常请使用 465 + SSL（use_ssl=true）。"
+                            )
+                        s.login(user, password)
+                        s.noop()
+                        s.sendmail(from_addr, recipients, msg.as_bytes())
+
+                if attempt > 1:
+                    print(f"[email] send succeeded on attempt {attempt}")
+                return
 
-        except (TimeoutError, smtplib.SMTPServerDisconnected, OSError, RuntimeError) as e:
-            last_err = e
-            if attempt <= retries:
-                sleep_s = retry_sleep * (2 ** (attempt - 1))
-                print(f"[email][warn] send failed (attempt {attempt}/{retries+1}): {e}")
-                print(f"[email] retrying in {sleep_s:.1f}s ...")
-                time.sleep(sleep_s)
-                continue
-            break
+            except smtplib.SMTPAuthenticationError as e:
+                raise RuntimeError(
+                    "SMTP 认证失败：请确认账号/授权码无误（很多邮箱需要“客户端授权码/应用专用密码”），并确认已开启 SMTP。"
+                    f"原始错误: {e}"
+                ) from e
+
+            except (TimeoutError, smtplib.SMTPServerDisconnected, OSError, RuntimeError) as e:
+                last_err = e
+                if attempt <= retries:
+                    sleep_s = retry_sleep * (2 ** (attempt - 1))
+                    print(f"[email][warn] send failed (attempt {attempt}/{retries+1}): {e}")
+                    print(f"[email] retrying in {sleep_s:.1f}s ...")
+                    time.sleep(sleep_s)
+                    continue
+                break
 
-    raise RuntimeError(
-        f"SMTP 发送失败（{host}:{port}）。常见原因：附件较大导致 DATA 阶段写入超时（可将 email.timeout 调到 180~300），或网络抖动/服务器限流断开。"
-        f"建议：email.timeout=180~300，或减少日报内容；可设置 email.retries/email.retry_sleep。"
-        f"最后错误: {last_err}"
-    ) from last_err
+        raise RuntimeError(
+            f"SMTP 发送失败（{host}:{port}）。常见原因：附件较大导致 DATA 阶段写入超时（可将 email.timeout 调到 180~300），或网络抖动/服务器限流断开。"
+            f"建议：email.timeout=180~300，或减少日报内容；可设置 email.retries/email.retry_sleep。"
+            f"最后错误: {last_err}"
+        ) from last_err
 
 
 def build_email_summary_body(rows: list[dict] | None, label: str, *, max_items: int = 10) -> str:
@@ -2493,6 +2896,12 @@ def resolve_slice_enabled(cfg: configparser.ConfigParser) -> bool:
     return cfg.get("report", "slice_enabled", fallback="false").strip().lower() in ("1", "true", "yes", "y")
 
 
+def resolve_rolling_pdf(cfg: configparser.ConfigParser) -> bool:
+    if cfg is None:
+        return False
+    return cfg.get("report", "rolling_pdf", fallback="false").strip().lower() in ("1", "true", "yes", "y")
+
+
 def resolve_slice_period(cfg: configparser.ConfigParser) -> str:
     if cfg is None:
         return "day"
@@ -2578,10 +2987,13 @@ def main():
     overall_started_at = _timer_start()
     args = parse_args()
     cfg = load_config(args.config)
+    # [mysql]/[email] 在真正连库 / 发信时才解析：--only-email、--no-email 等路径不读用不到的段，
+    # 那些段里的坏值也不会让整次运行在启动时就失败
     summary_sort = resolve_summary_sort(cfg, args.summary_sort)
     score_only = resolve_score_only(cfg, args.score_only)
     slice_enabled = resolve_slice_enabled(cfg)
     slice_period = resolve_slice_period(cfg)
+    rolling_pdf = resolve_rolling_pdf(cfg)
     now = dt.datetime.now()
     generated_outputs: list[tuple[str, str | None, str]] = []
     email_rows: list[dict] | None = None
@@ -2660,7 +3072,7 @@ def main():
             subject = f"单公司多年年报汇总 {title_label}"
             body = build_email_summary_body(rows, title_label)
             email_started_at = _timer_start()
-            send_email_with_attachment_smtp(cfg, to_addr, subject, body, out_pdf, out_epub)
+            send_email_with_attachment_smtp(_as_email_config(cfg), to_addr, subject, body, out_pdf, out_epub)
             print(f"已发送邮件到: {to_addr}")
             _log_stage_elapsed("single_stock.send_email", email_started_at)
         else:
@@ -2773,16 +3185,17 @@ def main():
 
         if not args.only_email:
             fetch_started_at = _timer_start()
-            conn = mysql_connect(cfg)
+            mysql_cfg = _as_mysql_config(cfg)
+            conn = mysql_connect(mysql_cfg)
             try:
-                rows = fetch_rows_by_created_at_range(conn, start_ts, end_ts)
+                # 流式读取：边读边按股票去重，只在内存里保留每只股票的最新一行
+                rows = keep_latest_report_per_stock(iter_rows_by_created_at_range(conn, start_ts, end_ts, cfg=mysql_cfg))
 
                 if not rows:
                     print(f"{range_label} 无新增入库年报记录，不生成汇总PDF")
                     # 不推进 last_generated_iso：避免出现“后续补入库但 created_at 落在旧窗口内”而被永远跳过。
                     return
 
-                rows = keep_latest_report_per_stock(rows)
                 rows = filter_rows_to_globally_latest_reports(conn, rows)
                 rows = filter_rows_to_publish_year(rows, run_date.year)
             finally:
@@ -2834,6 +3247,18 @@ def main():
                     print(f"已生成每日汇总EPUB: {out_epub} | summary_sort={summary_sort} | score_only={score_only}")
                     _log_stage_elapsed("incremental.generate_epub", epub_started_at)
                 generated_outputs = [(out_pdf, out_epub, range_label)]
+            # 可选：把本次增量 PDF 追加到当月的 rolling-YYYY-MM.pdf（只拷贝页面，不重新渲染历史内容）
+            if rolling_pdf:
+                try:
+                    rolling_started_at = _timer_start()
+                    rolling_path = None
+                    for gen_pdf, _gen_epub, _gen_label in generated_outputs:
+                        rolling_path = append_to_rolling_pdf(gen_pdf, run_date)
+                    if rolling_path:
+                        print(f"已追加到滚动汇总PDF: {rolling_path}")
+                    _log_stage_elapsed("incremental.append_rolling_pdf", rolling_started_at)
+                except Exception as e:
+                    print(f"[daily_report][warn] 滚动汇总PDF追加失败（忽略，不影响主流程）：{e}")
             # 同步到 Google Sheets（仅写客观字段，不覆盖 score/tags/notes/status）
             try:
                 sheets_started_at = _timer_start()
@@ -2856,6 +3281,7 @@ def main():
     if args.no_email:
         enabled = False
 
+    email_sent = False
     if enabled:
         to_raw = cfg.get("email", "to", fallback="")
         # 支持多个收件人：逗号/分号/空格分隔
@@ -2877,14 +3303,27 @@ def main():
         subject = f"年报摘录汇总 {email_label}"
         body = build_email_summary_body(email_rows, email_label)
         email_started_at = _timer_start()
-        send_email_with_attachment_smtp(cfg, to_addr, subject, body, email_pdf, email_epub)
+        send_email_with_attachment_smtp(_as_email_config(cfg), to_addr, subject, body, email_pdf, email_epub)
         print(f"已发送邮件到: {to_addr}")
         _log_stage_elapsed("daily.send_email", email_started_at)
+        email_sent = True
 
         if not manual_publish_date:
             save_last_sent_at(end_at)
     else:
         print("邮件发送未启用（email.enabled=false 或使用了 --no-email）")
+
+    save_last_run_stats({
+        "finished_iso": dt.datetime.now().replace(microsecond=0).isoformat(),
+        "mode": "manual" if manual_publish_date else "incremental",
+        "range_label": range_label,
+        "rows": len(email_rows) if email_rows is not None else None,
+        "outputs": [
+            {"pdf": str(p), "bytes": Path(p).stat().st_size if Path(p).exists() else None}
+            for p, _epub, _label in generated_outputs
+        ],
+        "email_sent": email_sent,
+    })
     _log_stage_elapsed("daily_report.total", overall_started_at)
 
 
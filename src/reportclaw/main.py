@@ -76,8 +76,6 @@ import re
 import sys
 import time
 import requests
-import pdfplumber
-from pdfminer.high_level import extract_text as pdfminer_extract_text
 import configparser
 import mysql.connector
 from datetime import datetime, timedelta
@@ -85,7 +83,7 @@ import traceback
 import json
 import concurrent.futures
 import subprocess
-from typing import Any
+from typing import Any, Sequence
 
 from pathlib import Path
 import signal
@@ -97,18 +95,21 @@ from reportclaw.mda_support import (
     extract_between_markers as extract_between_markers_impl,
     truncate_text as truncate_text_impl,
 )
-from reportclaw.parse_pipeline import build_parse_jobs, run_parse_jobs
+from reportclaw.parse_cache import ParseCache
+from reportclaw.parse_pipeline import iter_parse_jobs, iter_parse_results, preload_db_state
+from reportclaw.pdf_text import PdfDocument
 from reportclaw.parser_sections import (
     extract_section as extract_section_impl,
     extract_section_by_keywords as extract_section_by_keywords_impl,
     extract_section_by_ordinal as extract_section_by_ordinal_impl,
     next_ordinal_candidates as next_ordinal_candidates_impl,
+    search_heading as search_heading_impl,
     slice_to_next_bracket_heading as slice_to_next_bracket_heading_impl,
     slice_to_next_heading_with_title_keywords as slice_to_next_heading_with_title_keywords_impl,
     slice_to_next_major_heading as slice_to_next_major_heading_impl,
     slice_to_next_ordinal as slice_to_next_ordinal_impl,
 )
-from reportclaw.pipeline import fetch_candidate_announcements, dedupe_candidates, download_missing_pdfs
+from reportclaw.pipeline import fetch_candidate_announcements, dedupe_candidates, iter_downloaded_pdfs
 from reportclaw.repository import MySQLClient
 from reportclaw.runtime_config import load_main_runtime_config
 from reportclaw.state import load_last_crawl_ts, save_last_crawl_ts
@@ -281,16 +282,21 @@ def _parse_pdf_task(args: tuple[str, int | None, str | None, int | None]) -> dic
             "tag": tag,
             "pdf_name": pdf_name,
         }
+    finally:
+        parser._release_pdf()
 
 
 def _build_worker_fallback_result(c: dict[str, Any], e: Exception) -> dict[str, Any]:
     """Build a placeholder parse result when a worker crashes before returning a normal payload."""
     parser_local = AnnualReportParser()
-    fb = parser_local.build_fallback_mda(
-        c["file_path"],
-        reason=f"exception:{type(e).__name__}",
-        page_count=int(c.get("page_count") or 0),
-    )
+    try:
+        fb = parser_local.build_fallback_mda(
+            c["file_path"],
+            reason=f"exception:{type(e).__name__}",
+            page_count=int(c.get("page_count") or 0),
+        )
+    finally:
+        parser_local._release_pdf()
     return {
         "ok": False,
         "mda": fb,
@@ -829,6 +835,22 @@ def build_industry_client() -> Any:
 # ===============================
 # PDF解析器
 # ===============================
+# normalize() 用的正则：模块加载时编译一次
+_RE_MULTI_NEWLINE = re.compile(r"\n+")
+# 页眉/页脚/页码等噪声行（line 已 strip 且非空）：原先 8 个判断合并成一次 search。
+# 整行匹配部分：纯页码 11 / 页码 14/248 / 表格边框 ---+| / 仅公司名（<=30 字，以“有限公司”结尾）/
+#              <=20 字且含“年度报告”的页眉；
+# 子串部分：公司名+年度报告 页眉 / “年度报告全文” / “公司代码：” / 以“公司简称：”开头。
+_RE_DROP_LINE = re.compile(
+    r"\A(?:\d{1,4}(?:\s*/\s*\d{1,4})?|[-+|]{3,}|.{0,26}有限公司|(?=.{0,20}\Z).*年度报告.*)\Z|"
+    r"年度报告.*股份有限公司|股份有限公司.*年度报告|年度报告全文|公司代码：|\A公司简称："
+)
+# extract_mda：“(三、/3.) 报告期内核心竞争力分析”标题行；前缀与 parser_sections 的一级标题索引一致
+_RE_CORE_COMPETENCE_HEADING = re.compile(
+    r"(?:^|\n)\s*(?:[一二三四五六七八九十]{1,3}|\d{1,2})[、\.．:：]\s*[^\n]{0,80}核心竞争力分析"
+)
+
+
 class AnnualReportParser:
     """
     年报 PDF 文本解析器。
@@ -999,29 +1021,11 @@ class AnnualReportParser:
         large_file = isinstance(stats["file_mb"], (int, float)) and stats["file_mb"] >= max_file_mb
 
         try:
-            with pdfplumber.open(pdf_path) as pdf:
-                n = min(sample_pages, len(pdf.pages))
-                img_cnt = 0
-                txt_cnt = 0
-                for i in range(n):
-                    p = pdf.pages[i]
-
-                    # image count (cheap)
-                    try:
-                        img_cnt += len(getattr(p, "images", []) or [])
-                    except Exception:
-                        pass
-
-                    # text probe (cheap)
-                    try:
-                        s = p.extract_text() or ""
-                        txt_cnt += len(re.sub(r"\s+", "", s))
-                    except Exception:
-                        pass
-
-                stats["images"] = img_cnt
-                stats["text_chars"] = txt_cnt
-                stats["avg_text_chars"] = int(txt_cnt / max(n, 1))
+            # PyMuPDF 可用时走 C 实现，否则回退 pdfplumber（见 pdf_text.probe_pages）
+            n, img_cnt, txt_cnt = self._open_pdf(pdf_path).probe_pages(sample_pages)
+            stats["images"] = img_cnt
+            stats["text_chars"] = txt_cnt
+            stats["avg_text_chars"] = int(txt_cnt / max(n, 1))
         except Exception as e:
             stats["open_error"] = f"{type(e).__name__}: {e}"
             return False, stats
@@ -1069,11 +1073,63 @@ class AnnualReportParser:
             normalize_for_letter_fn=self.normalize_for_letter,
             is_image_heavy_pdf_fn=self._is_image_heavy_pdf,
             log_fn=self._log,
+            extract_raw_text_fn=self._extract_raw_text,
         )
 
+    def _open_pdf(self, pdf_path: str) -> PdfDocument:
+        """同一份 PDF 只打开一次：体检、分批取页、前置页/替代章节共用一个文档句柄。"""
+        doc = getattr(self, "_pdf_doc", None)
+        if doc is not None and doc.pdf_path == pdf_path:
+            return doc
+        self._close_pdf_doc()
+        doc = PdfDocument(pdf_path)
+        self._pdf_doc = doc
+        return doc
+
+    def _close_pdf_doc(self) -> None:
+        doc = getattr(self, "_pdf_doc", None)
+        if doc is not None:
+            doc.close()
+            self._pdf_doc = None
+
+    def _release_pdf(self) -> None:
+        """一份报告处理完：关闭文档句柄并丢弃整份页文本缓存，不把上一份年报的全文留到写库 / 下一次下载。
+
+        extract_mda 内部的 _close_pdf() 只关句柄、保留页缓存，随后的 build_fallback_mda 仍可复用。
+        """
+        self._close_pdf_doc()
+        self._page_cache_path = None
+        self._page_cache = {}
+
+    def _raw_page_texts(self, pdf_path: str, page_numbers=None) -> list[tuple[int, str]]:
+        """按页取原始文本；同一份 PDF 已抽过的页直接复用（extract_mda / alt sections / fallback 共用）。
+
+        缓存跟随 pdf_path：换一份 PDF 时清空，关闭文档句柄不影响已缓存的页。
+        """
+        if getattr(self, "_page_cache_path", None) != pdf_path:
+            self._page_cache_path = pdf_path
+            self._page_cache: dict[int, str | None] = {}
+        cache = self._page_cache
+
+        if page_numbers is None:
+            got = list(self._open_pdf(pdf_path).iter_page_texts(None))
+            cache.update(got)
+            return got
+
+        wanted = sorted({int(p) for p in page_numbers if int(p) >= 0})
+        missing = [p for p in wanted if p not in cache]
+        if missing:
+            got = dict(self._open_pdf(pdf_path).iter_page_texts(missing))
+            for p in missing:
+                cache[p] = got.get(p)  # None = 超出总页数，避免重复去读
+        return [(p, cache[p]) for p in wanted if cache[p] is not None]
+
+    def _extract_raw_text(self, pdf_path: str, page_numbers=None) -> str:
+        return "".join(f"{text}\x0c" for _, text in self._raw_page_texts(pdf_path, page_numbers))
+
     def extract_text(self, pdf_path, page_numbers=None):
-        # 使用 pdfminer 按页提取（支持只读指定页）
-        text = pdfminer_extract_text(pdf_path, page_numbers=page_numbers)
+        # 按页提取（支持只读指定页）；PyMuPDF 优先，pdfminer 兜底
+        text = self._extract_raw_text(pdf_path, page_numbers=page_numbers)
         if not text:
             return ""
         return self.normalize(text)
@@ -1088,63 +1144,38 @@ class AnnualReportParser:
             extract_chairman_letter_fn=self.extract_chairman_letter,
         )
 
-    def _slice_to_next_bracket_heading(self, text: str, start_idx: int):
+    def _slice_to_next_bracket_heading(self, text: str, start_idx: int | None) -> str | None:
         return slice_to_next_bracket_heading_impl(text, start_idx)
 
     def normalize(self, text):
         # 统一换行/去除不可见分页符
-        text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\x0c", "\n")
+        # 注意：不要改成 str.translate——中文文本（非 Latin-1）走逐字符查表，实测比 replace 慢几十倍。
+        # 抽取结果里极少有 \r，先用一次 memchr 级的 in 判断跳过两趟 replace 扫描。
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        text = text.replace("\x0c", "\n")
         text = self._compress_tables_keep_head_tail(text)
 
         # 先做一次基本清理
-        text = re.sub(r"\n+", "\n", text)
-
-        # 按行过滤页眉/页脚/页码等噪声
-        lines = []
-        for raw in text.split("\n"):
-            line = raw.strip()
-            if not line:
-                continue
-
-            # 1) 纯页码行（如：11）
-            if re.fullmatch(r"\d{1,4}", line):
-                continue
-
-            # 1.1) 形如 14/248 的页码
-            if re.fullmatch(r"\d{1,4}\s*/\s*\d{1,4}", line):
-                continue
-
-            # 1.2) 常见页眉（公司名 + 年度报告）
-            if ("年度报告" in line) and ("股份有限公司" in line):
-                continue
-
-            # 1.3) “公司代码/公司简称”页眉
-            if line.startswith("公司代码：") or line.startswith("公司简称：") or ("公司代码：" in line):
-                continue
-
-            # 1.4) 仅公司名一行的页眉（常见：XXX股份有限公司 / XXX有限公司）
-            if (line.endswith("股份有限公司") or line.endswith("有限公司")) and len(line) <= 30:
-                continue
-
-            # 1.5) 仅“XXXX年年度报告/年度报告全文/年度报告”一行的页眉（常与公司名分成两行）
-            if ("年度报告" in line) and len(line) <= 20:
-                continue
-
-            # 2) 表格边框/分隔符（如：---+、|、+--- 等）
-            if re.fullmatch(r"[-+|]{3,}", line):
-                continue
-
-            # 3) 常见年报页眉（包含“年度报告全文”）
-            if "年度报告全文" in line:
-                continue
-
-            lines.append(line)
+        text = _RE_MULTI_NEWLINE.sub("\n", text)
+
+        # 按行过滤页眉/页脚/页码等噪声（规则见 _RE_DROP_LINE）
+        # 先做子串预筛：_RE_DROP_LINE 的每个分支都要求行内含“公司”/“年度报告”，或行首是数字/-+|；
+        # 不满足的正文行（多数）不必进正则。isdecimal() 与 \d 同为 Unicode Nd。
+        lines = [
+            line
+            for line in (raw.strip() for raw in text.split("\n"))
+            if line
+            and not (
+                ("公司" in line or "年度报告" in line or line[0] in "-+|" or line[0].isdecimal())
+                and _RE_DROP_LINE.search(line)
+            )
+        ]
 
-        # 最后再做你原先的处理：去掉所有空格，并压缩多余空行
+        # 最后再做你原先的处理：去掉所有空格。
+        # 每行都已 strip 且非空，去空格后不会出现空行，原来这里的压缩空行是空操作，省掉一趟正则。
         text = "\n".join(lines)
-        text = text.replace(" ", "")
-        text = re.sub(r"\n+", "\n", text)
-        return text
+        return text.replace(" ", "")
 
     def extract_mda(self, pdf_path):
 
@@ -1163,14 +1194,15 @@ class AnnualReportParser:
         start_page = None
 
         # 性能优化（关键）：不要逐页调用 pdfplumber.extract_text（某些复杂 PDF 会极慢）。
-        # 改为：一次性用 pdfminer 抽取前 N 页文本，然后按分页符切分成 pages cache。
-        _pages: list[str] = []
-        _n_pages = 0
+        # 改为：按 20 页一批抽取（PyMuPDF 优先，pdfminer 兜底）并按需推进——
+        # 扫描到第几页才读到第几页，起始页/第四节边界靠前的年报不必读满 260 页。
+        _pages: list[str] = []  # 原始页文本，下标 == PDF 页码
+        _normalized: dict[int, str] = {}  # 首次访问时才 normalize：批内没被扫描到的页（如第四节之后）不做清洗
+        _pages_done = False  # 已到末页或上限
+        _pages_elapsed = 0.0
 
-        def _load_pages(max_pages: int) -> None:
-            nonlocal _pages, _n_pages
-            if _pages:
-                return
+        def _load_pages_until(p: int, max_pages: int = 260) -> None:
+            nonlocal _pages_done, _pages_elapsed
 
             # PERF GUARD:
             # pdfminer 对“复杂矢量/图文混排/超长表格/扫描图”的 PDF 可能分钟级卡顿。
@@ -1179,51 +1211,46 @@ class AnnualReportParser:
             max_total_seconds = 60.0  # 单个PDF在pages-cache阶段的总预算（你可以调小到30）
             max_batch_seconds = 20.0  # 单个batch预算（超过就认为该PDF极慢）
 
-            raw_pages_all: list[str] = []
-            t0 = time.perf_counter()
-
-            for start in range(0, max_pages, batch_size):
-                # 总预算
-                if (time.perf_counter() - t0) > max_total_seconds:
+            while not _pages_done and len(_pages) <= p:
+                # 总预算（只累计抽取耗时）
+                if _pages_elapsed > max_total_seconds:
                     raise RuntimeError("PARSE_TOO_SLOW")
 
+                start = len(_pages)
                 end = min(max_pages, start + batch_size)
                 page_nums = list(range(start, end))
 
                 tb = time.perf_counter()
                 try:
-                    raw_part = pdfminer_extract_text(pdf_path, page_numbers=page_nums) or ""
+                    part = [text for _, text in self._raw_page_texts(pdf_path, page_nums)]
                 except Exception:
-                    raw_part = ""
+                    # 整批失败时用空页占位，保证 _pages 下标 == PDF 页码
+                    part = [""] * len(page_nums)
                 batch_elapsed = time.perf_counter() - tb
+                _pages_elapsed += batch_elapsed
 
                 # 单batch都很慢：直接熔断
                 if batch_elapsed > max_batch_seconds:
                     raise RuntimeError("PARSE_TOO_SLOW")
 
-                if raw_part:
-                    raw_pages_all.extend(re.split(r"\x0c|\f", raw_part))
-
-            if not raw_pages_all:
-                _pages = []
-                _n_pages = 0
-                return
-
-            _pages = [self.normalize(p) for p in raw_pages_all]
-            _n_pages = len(_pages)
+                _pages.extend(part)
+                if len(part) < len(page_nums) or end >= max_pages:
+                    _pages_done = True  # 已到最后一页 / 上限
 
         def _get_page_text(p: int) -> str:
             if p < 0:
                 return ""
-            if not _pages:
-                _load_pages(260)
-            if p >= _n_pages:
+            _load_pages_until(p)
+            if p >= len(_pages):
                 return ""
-            return _pages[p] or ""
+            text = _normalized.get(p)
+            if text is None:
+                raw = _pages[p]
+                text = _normalized[p] = (self.normalize(raw) if raw else "") or ""
+            return text
 
         def _close_pdf() -> None:
-            # 兼容旧调用点：现在不需要 close 资源，但保持接口不变。
-            return
+            self._close_pdf_doc()
 
         # 经验：多数年报前 6 页为“重要提示/目录/释义”等前置信息，默认跳过。
         front_matter_max_pages = 5
@@ -1260,6 +1287,9 @@ class AnnualReportParser:
             """
             if not t:
                 return False
+            # 快速预筛：下面每条命中规则都要求“讨论”二字（可能被空白隔开），逐字判断与之等价
+            if "讨" not in t or "论" not in t:
+                return False
 
             compact_page = re.sub(r"\s+", "", t)
 
@@ -1332,22 +1362,21 @@ class AnnualReportParser:
             if not page_text:
                 continue
 
-            # 跳过前置页（尤其是前 6 页）
-            if p <= front_matter_max_pages and _is_front_matter_page(page_text):
+            # 先做便宜的标题判定（含“讨论”预筛），命中后再排除前置页/目录页
+            if not _looks_like_mda_heading(page_text):
                 continue
-            # 任何位置出现明显目录页，也跳过
             if _is_front_matter_page(page_text):
                 continue
 
-            if _looks_like_mda_heading(page_text):
-                start_page = p
-                break
+            start_page = p
+            break
 
         # 若没命中标题页：再找正文锚点（有些标题页是图片，无法提取文本）
         if start_page is None:
             for p in range(front_matter_max_pages + 1, 180):
                 page_text = _get_page_text(p)
-                if not page_text:
+                # 快速预筛：下面所有锚点都包含“业务”
+                if not page_text or "业务" not in page_text:
                     continue
                 if _is_front_matter_page(page_text):
                     continue
@@ -1417,21 +1446,25 @@ class AnnualReportParser:
             if not page_text:
                 continue
 
+            # 每条边界规则先用必含的子串预筛，正文页大多一条正则都不用跑
             # 3.1) 标准写法：第四节/第4节/第X节（X>=4）
-            if re.search(r"(?:^|\n)\s*第\s*(?:[四五六七八九十]|[4-9]|1\d)\s*节", page_text) or re.search(r"(?:第\s*四\s*节|第四节|第\s*4\s*节)", page_text):
+            if "节" in page_text and (
+                re.search(r"(?:^|\n)\s*第\s*(?:[四五六七八九十]|[4-9]|1\d)\s*节", page_text)
+                or re.search(r"(?:第\s*四\s*节|第四节|第\s*4\s*节)", page_text)
+            ):
                 break
 
             # 3.2) 另一类模板：用大号章节号（04/4）+ 公司治理…
-            if re.search(r"(?:^|\n)\s*0?4\s*(?:公司治理|公司治理、环境和社会)", page_text):
+            if "公司治理" in page_text and re.search(r"(?:^|\n)\s*0?4\s*(?:公司治理|公司治理、环境和社会)", page_text):
                 break
             if "公司治理、环境和社会" in page_text:
                 break
 
             # 3.3) 兜底：明显已经进入第三节之外的后续章节（避免把第十二/十三等章节带进 MDA）
             # 这些章节在不少年报里属于“公司治理/投资者关系/市值管理”等板块
-            if re.search(r"(?:^|\n|\b)\s*(?:十\s*二|12)\s*[、\.．:：]?\s*报告期内接待调研", page_text):
+            if "接待调研" in page_text and re.search(r"(?:^|\n|\b)\s*(?:十\s*二|12)\s*[、\.．:：]?\s*报告期内接待调研", page_text):
                 break
-            if re.search(r"(?:^|\n|\b)\s*(?:十\s*三|13)\s*[、\.．:：]?\s*市值管理", page_text):
+            if "市值管理" in page_text and re.search(r"(?:^|\n|\b)\s*(?:十\s*三|13)\s*[、\.．:：]?\s*市值管理", page_text):
                 break
 
             mda_text += page_text + "\n"
@@ -1495,10 +1528,8 @@ class AnnualReportParser:
 
         # 二次兜底：有些PDF标题行被拆行/缺标点，导致上面的切分没命中 stop_titles。
         # 这里直接用正则定位“(三、/3.) 报告期内核心竞争力分析/核心竞争力分析”并强制截断，确保不包含该章节。
-        m_core = re.search(
-            r"(?:^|\n)\s*(?:[一二三四五六七八九十]{1,3}|\d{1,2})[、\.．:：]\s*[^\n]{0,80}核心竞争力分析",
-            mda_text
-        )
+        # 走一级标题索引（同一份 mda_text 只建一次，下面 extract_section_by_keywords 复用）
+        m_core = search_heading_impl(_RE_CORE_COMPETENCE_HEADING, mda_text)
         if m_core and m_core.start() > 0:
             management_overview = mda_text[:m_core.start()].strip()
 
@@ -1588,19 +1619,19 @@ class AnnualReportParser:
             "full_mda": mda_text
         }
 
-    def _slice_to_next_heading_with_title_keywords(self, text, start_idx, title_keywords):
+    def _slice_to_next_heading_with_title_keywords(self, text: str, start_idx: int | None, title_keywords: Sequence[str]) -> str | None:
         return slice_to_next_heading_with_title_keywords_impl(text, start_idx, title_keywords)
 
-    def _slice_to_next_major_heading(self, text, start_idx):
+    def _slice_to_next_major_heading(self, text: str, start_idx: int | None) -> str | None:
         return slice_to_next_major_heading_impl(text, start_idx, self.MAJOR_HEADING_KEYWORDS)
 
-    def _next_ordinal_candidates(self, current_ordinal: str):
+    def _next_ordinal_candidates(self, current_ordinal: str) -> list[str]:
         return next_ordinal_candidates_impl(current_ordinal)
 
-    def _slice_to_next_ordinal(self, text, start_idx, current_ordinal: str):
+    def _slice_to_next_ordinal(self, text: str, start_idx: int | None, current_ordinal: str) -> str | None:
         return slice_to_next_ordinal_impl(text, start_idx, current_ordinal, self.MAJOR_HEADING_KEYWORDS)
 
-    def extract_section_by_ordinal(self, text, ordinal_cn, keyword_fallback=None):
+    def extract_section_by_ordinal(self, text: str, ordinal_cn: str, keyword_fallback: Sequence[str] | None = None) -> str | None:
         return extract_section_by_ordinal_impl(
             text,
             ordinal_cn,
@@ -1608,7 +1639,13 @@ class AnnualReportParser:
             major_heading_keywords=self.MAJOR_HEADING_KEYWORDS,
         )
 
-    def extract_section_by_keywords(self, text, keywords, fallback_ordinals=None, end_title_keywords=None):
+    def extract_section_by_keywords(
+        self,
+        text: str,
+        keywords: Sequence[str],
+        fallback_ordinals: Sequence[str] | None = None,
+        end_title_keywords: Sequence[str] | None = None,
+    ) -> str | None:
         return extract_section_by_keywords_impl(
             text,
             keywords,
@@ -1617,7 +1654,7 @@ class AnnualReportParser:
             major_heading_keywords=self.MAJOR_HEADING_KEYWORDS,
         )
 
-    def extract_section(self, text, title):
+    def extract_section(self, text: str, title: str) -> str | None:
         return extract_section_impl(text, title)
 
 
@@ -1695,12 +1732,21 @@ def main():
     max_workers_download = runtime.max_workers_download
     max_workers_parse = runtime.max_workers_parse
     parse_backend = runtime.parse_backend
+    # pdf_text 按环境变量选文本后端；写进环境后 parse worker 进程也会继承
+    os.environ["REPORTCLAW_PDF_BACKEND"] = runtime.pdf_backend
+    parse_cache = ParseCache(CACHE_DIR / "parsed", runtime.parse_cache_max_entries) if runtime.parse_cache else None
 
     session = requests.Session()
     session.headers.update({
         "User-Agent": "Mozilla/5.0",
         "X-Requested-With": "XMLHttpRequest"
     })
+    # 下载线程共用这一个 session；默认连接池每个 host 只保留 10 条 keep-alive 连接，
+    # 线程数更多时多出来的连接用完即丢，下一次请求又要重新握手。按下载线程数放大连接池。
+    pool_size = max(10, max_workers_download)
+    adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
 
     POST_TIMEOUT = (5, 20)   # (connect, read)
     GET_TIMEOUT = (5, 60)    # pdf download can be slower
@@ -1779,12 +1825,9 @@ def main():
     # ------------------------------------------------------------------
     # Phase 5: 下载缺失 PDF
     # - 下载使用线程池
-    # - 这里只负责把文件落到本地，不做解析和入库
-    #
-    # 后续拆分建议：
-    # - download_missing_pdfs(candidates, session, ...)
+    # - 已存在的文件立即产出，缺失的下载完成一个产出一个（生成器）
     # ------------------------------------------------------------------
-    download_missing_pdfs(
+    downloaded = iter_downloaded_pdfs(
         candidates,
         session=session,
         get_timeout=GET_TIMEOUT,
@@ -1801,43 +1844,47 @@ def main():
     #
     # 这段实际上是在做“解析前调度决策”，适合将来拆到 pipeline/planner 层。
     # ------------------------------------------------------------------
-    parse_jobs = build_parse_jobs(
-        candidates,
+    # 一次性预取候选的入库状态，后面的 get_report_id / is_mda_complete 不再逐条查库
+    preload_db_state(candidates, db=db, reparse_existing=reparse_existing)
+    parse_jobs = iter_parse_jobs(
+        downloaded,
         db=db,
         reparse_existing=reparse_existing,
     )
 
-    print(f"[perf] parse_jobs={len(parse_jobs)} (backend={parse_backend}, workers={max_workers_parse})")
-
     # ------------------------------------------------------------------
     # Phase 7: 并行解析 PDF
     # - worker 内只做纯解析，不共享 DB 连接
     # - 若 worker 异常，主线程构造 fallback placeholder
-    #
-    # 这里已经天然具备拆成 parser worker 层的条件。
+    # - 下载 → 任务过滤 → 提交解析 → 落库 是一条惰性流水线：第一份 PDF 落盘就开始解析，
+    #   解析完一份就在主线程写一份（下载走线程池 I/O，解析走进程/线程池 CPU，写库/行业查询走主线程，三者重叠）
     # ------------------------------------------------------------------
-    parse_results = run_parse_jobs(
-        parse_jobs,
-        parse_backend=parse_backend,
-        max_workers_parse=max_workers_parse,
-        parse_fn=_parse_pdf_task,
-        fallback_on_worker_error=_build_worker_fallback_result,
-    )
-
-    # 主线程写库（避免多进程共享 DB 连接）
-    # 按披露时间从新到旧写入，便于你查看日志
-    parse_results.sort(key=lambda x: (x[0].get("ts") or 0), reverse=True)
+    print(f"[perf] streaming parse jobs (backend={parse_backend}, workers={max_workers_parse})")
+    parse_results: list[tuple[dict, dict]] = []
     written_report_ids: list[int] = []
+    # MDA 正文是大字段：攒一批再用 executemany + 单次 commit 写入，减少往返与 fsync。
+    # annual_reports / stock_master_cn 的写入不单独提交，与这一批 MDA 同一事务提交：
+    # 中途崩溃时整批回滚（下次运行重试），不会留下没有 MDA 的报告行。
+    mda_write_batch_size = 20
+    pending_mda_writes: list[tuple[int, dict]] = []
 
     # ------------------------------------------------------------------
-    # Phase 8: 落库与日志输出
+    # Phase 8: 落库与日志输出（按解析完成顺序，主线程写库，避免多进程共享 DB 连接）
     # - annual_reports upsert
     # - annual_report_mda upsert
     # - 补充行业信息
     #
     # 未来可以把“数据组装”和“repository 调用”再分开一层，进一步瘦身 main()。
     # ------------------------------------------------------------------
-    for c, res in parse_results:
+    for c, res in iter_parse_results(
+        parse_jobs,
+        parse_backend=parse_backend,
+        max_workers_parse=max_workers_parse,
+        parse_fn=_parse_pdf_task,
+        fallback_on_worker_error=_build_worker_fallback_result,
+        cache=parse_cache,
+    ):
+        parse_results.append((c, res))
         col = c.get("col")
         stock_code = c["stock_code"]
         year = c["year"]
@@ -1856,16 +1903,29 @@ def main():
             c["publish_date"],
             c["file_path"],
             industry_info=industry_info,
+            commit=False,
         )
-        db.upsert_stock_master_industry(stock_code, c["stock_name"], industry_info)
-        db.insert_mda(report_id, res.get("mda") or {})
+        db.upsert_stock_master_industry(stock_code, c["stock_name"], industry_info, commit=False)
+        pending_mda_writes.append((int(report_id), res.get("mda") or {}))
         written_report_ids.append(int(report_id))
+        if len(pending_mda_writes) >= mda_write_batch_size:
+            db.insert_mda_bulk(pending_mda_writes)
+            pending_mda_writes = []
 
         if res.get("ok"):
             print(f"完成：{tag} ({col}) elapsed={elapsed:.2f}s")
         else:
             print(f"[{col}] 已入库 placeholder（可重试覆盖）: {tag} reason={res.get('reason')} elapsed={elapsed:.2f}s")
 
+    if pending_mda_writes:
+        db.insert_mda_bulk(pending_mda_writes)
+        pending_mda_writes = []
+
+    print(f"[perf] parse_jobs={len(parse_results)} (backend={parse_backend}, workers={max_workers_parse})")
+    if parse_cache is not None:
+        pruned = parse_cache.prune()
+        print(f"[perf] parse_cache hits={parse_cache.hits} misses={parse_cache.misses} pruned={pruned}")
+
     # 性能摘要：打印最慢的若干个 PDF 解析耗时
     if parse_results:
         # --------------------------------------------------------------
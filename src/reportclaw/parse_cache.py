@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import functools
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from reportclaw.pdf_text import use_pymupdf
+
+# 解析结果只依赖 PDF 文件本身 + 解析代码；任一变化都要让旧缓存失效。
+_PARSER_SOURCES = (
+    "main.py",
+    "parser_sections.py",
+    "chairman_letter.py",
+    "mda_support.py",
+    "pdf_text.py",
+)
+
+# 这些 reason 是对同一文件可复现的结论；worker 异常等瞬时失败不缓存，下次仍重试。
+_CACHEABLE_REASONS = ("", "mda_not_found", "image_heavy_skip")
+
+
+@functools.lru_cache(maxsize=1)
+def parser_fingerprint() -> str:
+    """Digest of the parser source files and the text-extraction backend."""
+    h = hashlib.sha1()
+    here = Path(__file__).resolve().parent
+    for name in _PARSER_SOURCES:
+        h.update(name.encode("utf-8"))
+        try:
+            h.update((here / name).read_bytes())
+        except Exception:
+            h.update(b"<missing>")
+    h.update(b"pymupdf" if use_pymupdf() else b"pdfminer")
+    return h.hexdigest()
+
+
+class ParseCache:
+    """On-disk cache of per-PDF parse results: data/cache/parsed/<sha1>.json.
+
+    Key = sha1(abs path | mtime_ns | size | parser fingerprint). Entries are touched on hit and
+    the least recently used ones are removed by prune() once max_entries is exceeded.
+    """
+
+    def __init__(self, cache_dir: Path, max_entries: int = 5000):
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, pdf_path: str) -> str | None:
+        try:
+            st = os.stat(pdf_path)
+        except Exception:
+            return None
+        raw = f"{os.path.abspath(pdf_path)}|{st.st_mtime_ns}|{st.st_size}|{parser_fingerprint()}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, pdf_path: str) -> dict[str, Any] | None:
+        key = self._key(pdf_path)
+        path = self.cache_dir / f"{key}.json" if key else None
+        if path is None or not path.exists():
+            self.misses += 1
+            return None
+        try:
+            res = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)
+        except Exception as e:
+            print(f"[parse_cache] read failed, ignoring entry: {path.name} err={e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return res
+
+    def put(self, pdf_path: str, res: dict[str, Any]) -> None:
+        if (res.get("reason") or "") not in _CACHEABLE_REASONS:
+            return
+        key = self._key(pdf_path)
+        if not key:
+            return
+        path = self.cache_dir / f"{key}.json"
+        tmp = path.with_suffix(".json.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp.write_text(json.dumps(res, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, path)
+        except Exception as e:
+            print(f"[parse_cache] write failed: {path.name} err={e}")
+            try:
+                tmp.unlink()
+            except Exception:
+                pass
+
+    def prune(self) -> int:
+        """Drop least recently used entries beyond max_entries; returns the number removed."""
+        try:
+            entries = [(p.stat().st_mtime, p) for p in self.cache_dir.glob("*.json")]
+        except Exception:
+            return 0
+        if len(entries) <= self.max_entries:
+            return 0
+        entries.sort(key=lambda x: x[0])
+        removed = 0
+        for _, p in entries[: len(entries) - self.max_entries]:
+            try:
+                p.unlink()
+                removed += 1
+            except Exception:
+                pass
+        return removed
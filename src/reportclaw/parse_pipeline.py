@@ -2,19 +2,35 @@ from __future__ import annotations
 
 import concurrent.futures
 import os
-from typing import Any, Callable
+from typing import Any, Callable, Iterable, Iterator
 
-import pdfplumber
+from reportclaw.pdf_text import page_count as pdf_page_count
 
 
-def build_parse_jobs(
-    candidates: list[dict[str, Any]],
+def preload_db_state(candidates: Iterable[dict[str, Any]], *, db: Any, reparse_existing: bool) -> None:
+    """Prefetch what iter_parse_jobs asks the DB about, so it does not query once per candidate.
+
+    - 候选年份已入库的 (stock_code, year) -> id
+    - reparse_existing=False 时，再取这些已入库候选报告的 MDA 完整性（只查候选，不扫整年）
+    """
+    candidates = list(candidates)
+    db.preload_existing({c.get("year") for c in candidates})
+    if not reparse_existing:
+        db.preload_mda_complete(
+            rid for c in candidates if (rid := db.get_report_id(c["stock_code"], c["year"])) is not None
+        )
+
+
+def iter_parse_jobs(
+    candidates: Iterable[dict[str, Any]],
     *,
     db: Any,
     reparse_existing: bool,
-) -> list[dict[str, Any]]:
-    """Build parse jobs after local-file checks, PDF page checks, and DB checks."""
-    parse_jobs: list[dict[str, Any]] = []
+) -> Iterator[dict[str, Any]]:
+    """Yield parse jobs one by one after local-file checks, PDF page checks, and DB checks.
+
+    candidates 可以是边下载边产出的生成器；调用方需先 preload_db_state(...)。
+    """
     for c in candidates:
         file_path = c["file_path"]
         if not os.path.exists(file_path):
@@ -24,8 +40,7 @@ def build_parse_jobs(
             continue
 
         try:
-            with pdfplumber.open(file_path) as pdf:
-                page_count = len(pdf.pages)
+            page_count = pdf_page_count(file_path)
         except Exception as e:
             print(f"无法读取PDF页数，跳过: {c['title']} err={e}")
             continue
@@ -35,46 +50,97 @@ def build_parse_jobs(
 
         c["page_count"] = page_count
 
-        existing_id = db.get_report_id(c["stock_code"], c["year"])
-        if existing_id is not None and db.is_mda_complete(existing_id):
-            if not reparse_existing:
+        if not reparse_existing:
+            existing_id = db.get_report_id(c["stock_code"], c["year"])
+            if existing_id is not None and db.is_mda_complete(existing_id):
                 continue
 
-        parse_jobs.append(c)
+        yield c
 
-    return parse_jobs
 
+def build_parse_jobs(
+    candidates: list[dict[str, Any]],
+    *,
+    db: Any,
+    reparse_existing: bool,
+) -> list[dict[str, Any]]:
+    """Build parse jobs after local-file checks, PDF page checks, and DB checks."""
+    preload_db_state(candidates, db=db, reparse_existing=reparse_existing)
+    return list(iter_parse_jobs(candidates, db=db, reparse_existing=reparse_existing))
 
-def run_parse_jobs(
-    parse_jobs: list[dict[str, Any]],
+
+def iter_parse_results(
+    parse_jobs: Iterable[dict[str, Any]],
     *,
     parse_backend: str,
     max_workers_parse: int,
     parse_fn: Callable[[tuple[str, int | None, str | None, int | None]], dict[str, Any]],
     fallback_on_worker_error: Callable[[dict[str, Any], Exception], dict[str, Any]],
-) -> list[tuple[dict[str, Any], dict[str, Any]]]:
-    """Run parse jobs in parallel and return paired (candidate, result) rows."""
-    parse_results: list[tuple[dict[str, Any], dict[str, Any]]] = []
-    if not parse_jobs:
-        return parse_results
-
+    cache: Any = None,
+) -> Iterator[tuple[dict[str, Any], dict[str, Any]]]:
+    """Run parse jobs in parallel and yield (candidate, result) pairs in completion order.
+
+    parse_jobs may be a lazy iterator: each job is submitted as soon as it is produced,
+    so parsing overlaps with whatever produces the jobs (e.g. PDF downloads). Finished
+    results are handed back while later jobs are still being submitted, so the caller
+    can write them to the DB without waiting for the whole batch.
+    cache: optional ParseCache; hits skip the worker pool, fresh results are stored back.
+    """
     executor_cls = (
         concurrent.futures.ProcessPoolExecutor
         if parse_backend == "process"
         else concurrent.futures.ThreadPoolExecutor
     )
 
+    def _collect(fut: concurrent.futures.Future, c: dict[str, Any]) -> dict[str, Any]:
+        try:
+            res = fut.result()
+        except Exception as e:
+            return fallback_on_worker_error(c, e)
+        if cache is not None:
+            cache.put(c["file_path"], res)
+        return res
+
     with executor_cls(max_workers=max_workers_parse) as ex:
-        fut_map = {
-            ex.submit(parse_fn, (c["file_path"], c.get("page_count"), c.get("stock_code"), c.get("year"))): c
-            for c in parse_jobs
-        }
-        for fut in concurrent.futures.as_completed(fut_map):
-            c = fut_map[fut]
-            try:
-                res = fut.result()
-            except Exception as e:
-                res = fallback_on_worker_error(c, e)
-            parse_results.append((c, res))
-
-    return parse_results
+        fut_map: dict[concurrent.futures.Future, dict[str, Any]] = {}
+        for c in parse_jobs:
+            if cache is not None:
+                cached = cache.get(c["file_path"])
+                if cached is not None:
+                    cached["elapsed_sec"] = 0.0
+                    cached["cache_hit"] = True
+                    yield c, cached
+                    continue
+            fut_map[ex.submit(parse_fn, (c["file_path"], c.get("page_count"), c.get("stock_code"), c.get("year")))] = c
+
+            # 边提交边收割：已完成的先交给调用方落库
+            for fut in [f for f in fut_map if f.done()]:
+                c = fut_map.pop(fut)
+                yield c, _collect(fut, c)
+
+        for fut in concurrent.futures.as_completed(list(fut_map)):
+            yield fut_map[fut], _collect(fut, fut_map[fut])
+
+
+def run_parse_jobs(
+    parse_jobs: Iterable[dict[str, Any]],
+    *,
+    parse_backend: str,
+    max_workers_parse: int,
+    parse_fn: Callable[[tuple[str, int | None, str | None, int | None]], dict[str, Any]],
+    fallback_on_worker_error: Callable[[dict[str, Any], Exception], dict[str, Any]],
+    cache: Any = None,
+) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+    """Run parse jobs in parallel and return paired (candidate, result) rows."""
+    if isinstance(parse_jobs, list) and not parse_jobs:
+        return []
+    return list(
+        iter_parse_results(
+            parse_jobs,
+            parse_backend=parse_backend,
+            max_workers_parse=max_workers_parse,
+            parse_fn=parse_fn,
+            fallback_on_worker_error=fallback_on_worker_error,
+            cache=cache,
+        )
+    )
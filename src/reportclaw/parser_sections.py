@@ -1,29 +1,221 @@
 from __future__ import annotations
 
+import functools
 import re
+from typing import Callable, Iterator, Sequence
 
+# 可选 RE2（google-re2 / pyre2）：DFA 实现，长文本上的 [^\n]{1,80}/[^\n]* 扫描保证线性时间。
+# 未安装时全部走标准库 re。
+try:
+    import re2  # type: ignore
+    RE2_AVAILABLE = True
+except Exception:
+    re2 = None
+    RE2_AVAILABLE = False
 
-def slice_to_next_bracket_heading(text: str, start_idx: int):
+# str 模式下 Python 的 \s 匹配全部 Unicode 空白（含全角空格 \u3000），RE2 只认 ASCII 空白；
+# 翻成显式字符集后两边语义一致（与 str.isspace() 同集合）。\d 同理对应 \p{Nd}。
+_RE2_SPACE_SET = r"\t-\r\x{1c}-\x{20}\x{85}\x{a0}\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}"
+
+
+def _to_re2_pattern(pattern: str) -> str | None:
+    r"""Rewrite a stdlib pattern into an RE2 pattern with identical semantics, or None if unsure.
+
+    \s / \d / \Z are translated; \w \b 等依赖 Unicode 单词定义的转义以及 $ 直接放弃，交给 re。
+    Lookarounds / backrefs are rejected by re2.compile itself.
+    """
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    in_class = False
+    class_body_start = -1
+    while i < n:
+        ch = pattern[i]
+        if ch == "\\" and i + 1 < n:
+            nxt = pattern[i + 1]
+            if nxt == "s":
+                out.append(_RE2_SPACE_SET if in_class else f"[{_RE2_SPACE_SET}]")
+            elif nxt == "d":
+                out.append(r"\p{Nd}")
+            elif nxt == "Z" and not in_class:
+                out.append(r"\z")
+            elif nxt in "SDwWbBZ":
+                return None
+            else:
+                out.append(pattern[i:i + 2])
+            i += 2
+            continue
+        if in_class:
+            if ch == "]" and i != class_body_start:
+                in_class = False
+        elif ch == "[":
+            in_class = True
+            class_body_start = i + 1
+            if pattern[i + 1:i + 2] == "^":
+                class_body_start += 1
+                out.append("[^")
+                i += 2
+                continue
+        elif ch == "$":
+            return None
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _compile(pattern: str) -> re.Pattern:
+    """re2.compile when RE2 is installed and the pattern translates cleanly, else re.compile."""
+    if RE2_AVAILABLE:
+        translated = _to_re2_pattern(pattern)
+        if translated is not None:
+            try:
+                return re2.compile(translated)
+            except Exception:
+                pass
+    return re.compile(pattern)
+
+
+class _LineStartPattern:
+    r"""`(?:^|\n)<body>` that can be searched from pos without slicing text[pos:].
+
+    With a pos argument `^` no longer matches at pos, so the start-of-slice branch is tried as
+    `<body>` anchored at pos and everything after it with `\n<body>` — same matches, same order
+    as running the original pattern on the slice.
+    """
+
+    __slots__ = ("_at_pos", "_after_newline")
+
+    def __init__(self, body: str):
+        self._at_pos = _compile(body)
+        self._after_newline = _compile(r"\n" + body)
+
+    def search(self, text: str, pos: int = 0) -> re.Match | None:
+        return self._at_pos.match(text, pos) or self._after_newline.search(text, pos)
+
+    def finditer(self, text: str, pos: int = 0) -> Iterator[re.Match]:
+        m = self._at_pos.match(text, pos)
+        if m:
+            yield m
+            pos = m.end()
+        yield from self._after_newline.finditer(text, pos)
+
+
+# 静态模式在模块加载时编译一次；含序号/关键词的动态模式按参数 lru_cache，
+# 避免每次调用都重新拼 f-string 再走 re 模块内部缓存查找。
+_SUB_HEADING_RE = _compile(r"(?:\n\s*[（(][一二三四五六七八九十0-9]{1,3}[）)])")
+_MAJOR_HEADING_RE = _compile(r"(?:\n\s*(?:[一二三四五六七八九十]{1,3}|\d{1,2})、)")
+_ORDINAL_TITLE_LINE_RE = _LineStartPattern(r"\s*([一二三四五六七八九十]{1,3}|\d{1,2})[、\.．:：]\s*([^\n]{1,80})")
+_BRACKET_TITLE_LINE_RE = _LineStartPattern(r"\s*[（(][一二三四五六七八九十0-9]{1,3}[）)]\s*([^\n]{1,80})")
+_MAJOR_TITLE_LINE_RE = _compile(r"(?:\n\s*([一二三四五六七八九十]{1,3}|\d{1,2})、([^\n]{1,60}))")
+_ARABIC_ORDINAL_RE = re.compile(r"\d{1,2}")
+_DOTTED_NUM_HEAD_RE = _LineStartPattern(r"\s*\d+(?:[\.．]\d+){1,3}\b")
+_ORDINAL_HEAD_RE = _LineStartPattern(r"\s*(?:[一二三四五六七八九十]{1,3}|\d{1,2})[、\.．:：]")
+_CHAPTER_HEAD_RE = _LineStartPattern(r"\s*第\s*[一二三四五六七八九十]{1,3}\s*[章节]")
+
+# 标题行索引：_keyword_heading_res 三类模式各自的公共前缀（到序号/编号/括号为止）。
+# 关键词模式只可能在这些前缀命中的位置匹配，所以全文只扫一遍建索引，之后逐个关键词只在索引位置做锚定 match。
+ORDINAL_HEADING, DOTTED_HEADING, BRACKET_HEADING = 0, 1, 2
+_HEADING_PREFIX_RES = (
+    _ORDINAL_HEAD_RE,
+    _LineStartPattern(r"\s*\d+(?:[\.．]\d+){1,3}"),
+    _LineStartPattern(r"\s*[（(][一二三四五六七八九十0-9]{1,3}[）)]"),
+)
+
+
+@functools.lru_cache(maxsize=256)
+def _next_ordinal_res(cand: str) -> tuple[_LineStartPattern, re.Pattern]:
+    """(line-start pattern, anywhere pattern) for the next ordinal heading `cand、`."""
+    if _ARABIC_ORDINAL_RE.fullmatch(cand):
+        cand_pat = re.escape(cand)
+    else:
+        cand_pat = r"\\s*".join(re.escape(ch) for ch in cand)
+    return _LineStartPattern(rf"\s*{cand_pat}\s*、"), _compile(rf"{cand_pat}\s*、")
+
+
+@functools.lru_cache(maxsize=256)
+def _ordinal_start_res(ordinal: str) -> tuple[re.Pattern, re.Pattern]:
+    """(`X、` heading, `（X）/(X)` heading) patterns for one ordinal."""
+    return (
+        _compile(rf"(?:^|\n)\s*{ordinal}、"),
+        _compile(rf"(?:^|\n)\s*(?:（{ordinal}）|\({ordinal}\))"),
+    )
+
+
+@functools.lru_cache(maxsize=512)
+def _line_start_re(kw: str) -> re.Pattern:
+    return _compile(rf"(?:^|\n)\s*{kw}")
+
+
+@functools.lru_cache(maxsize=512)
+def _keyword_heading_res(kw: str) -> tuple[re.Pattern, re.Pattern, re.Pattern]:
+    """(ordinal heading, dotted-number heading, bracket heading) patterns containing keyword kw."""
+    kw_pat = kw[len("REGEX:"):] if isinstance(kw, str) and kw.startswith("REGEX:") else re.escape(str(kw))
+    return (
+        _compile(rf"(?:^|\n)\s*([一二三四五六七八九十]{{1,3}}|\d{{1,2}})[、\.．:：]\s*[^\n]*{kw_pat}[^\n]*"),
+        _compile(rf"(?:^|\n)\s*(\d+(?:[\.．]\d+){{1,3}})\s*[、\.．:：]?\s*[^\n]*{kw_pat}[^\n]*"),
+        _compile(rf"(?:^|\n)\s*[（(]([一二三四五六七八九十0-9]{{1,3}})[）)]\s*[^\n]*{kw_pat}[^\n]*"),
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _title_keyword_search(keywords: tuple[str, ...]) -> Callable[[str], re.Match | None]:
+    """`.search` of one alternation over keywords: a title is scanned once instead of once per keyword.
+
+    Keywords containing another keyword are dropped first (e.g. 主营业务分析 is implied by 主营业务),
+    so the match/no-match answer is the same as any(kw in title for kw in keywords).
+    """
+    uniq = list(dict.fromkeys(str(k) for k in keywords))
+    if not uniq:
+        return lambda title: None
+    minimal = [k for k in uniq if not any(o != k and o in k for o in uniq)]
+    return _compile("|".join(re.escape(k) for k in minimal)).search
+
+
+@functools.lru_cache(maxsize=8)
+def _heading_starts(text: str, kind: int) -> tuple[int, ...]:
+    """Offsets where a heading line of the given kind starts (one scan per text; str hash is cached)."""
+    return tuple(m.start() for m in _HEADING_PREFIX_RES[kind].finditer(text))
+
+
+def search_heading(pattern: re.Pattern, text: str, kind: int = ORDINAL_HEADING) -> re.Match | None:
+    r"""pattern.search(text) for a `(?:^|\n)\s*<heading prefix of kind>...` pattern, via the heading index.
+
+    Same result as a full search: the pattern can only match where its prefix matches, and inside
+    one leading-whitespace run every start offset gives the same match, so the index's leftmost one
+    is the one search() would report.
+    """
+    for p in _heading_starts(text, kind):
+        m = pattern.match(text, p)
+        if m:
+            return m
+    return None
+
+
+@functools.lru_cache(maxsize=128)
+def _section_re(title: str) -> re.Pattern:
+    return _compile(rf"{title}[\s\S]*?(?=\n[一二三四五六七八九十]+、|\Z)")
+
+
+def slice_to_next_bracket_heading(text: str, start_idx: int | None) -> str | None:
     """从（X）/ (X) 这类括号小标题开始切，到下一条同级括号小标题或下一条一级大标题。"""
     if start_idx is None or start_idx < 0:
         return None
 
     next_sub = None
-    m_sub = re.search(r"(?:\n\s*[（(][一二三四五六七八九十0-9]{1,3}[）)])", text[start_idx + 1:])
+    m_sub = _SUB_HEADING_RE.search(text, start_idx + 1)
     if m_sub:
-        next_sub = start_idx + 1 + m_sub.start()
+        next_sub = m_sub.start()
 
     next_major = None
-    m_major = re.search(r"(?:\n\s*(?:[一二三四五六七八九十]{1,3}|\d{1,2})、)", text[start_idx + 1:])
+    m_major = _MAJOR_HEADING_RE.search(text, start_idx + 1)
     if m_major:
-        next_major = start_idx + 1 + m_major.start()
+        next_major = m_major.start()
 
     candidates = [p for p in (next_sub, next_major) if p is not None]
     end_idx = min(candidates) if candidates else len(text)
     return text[start_idx:end_idx].strip()
 
 
-def slice_to_next_heading_with_title_keywords(text, start_idx, title_keywords):
+def slice_to_next_heading_with_title_keywords(text: str, start_idx: int | None, title_keywords: Sequence[str]) -> str | None:
     """
     从 start_idx 切到“下一条标题”，且该标题行的标题部分包含 title_keywords 之一。
     同时支持：
@@ -33,77 +225,70 @@ def slice_to_next_heading_with_title_keywords(text, start_idx, title_keywords):
     if start_idx is None or start_idx < 0:
         return None
 
-    candidates = []
+    has_keyword = _title_keyword_search(tuple(title_keywords))
+    hit = None
 
-    for m in re.finditer(
-        r"(?:^|\n)\s*([一二三四五六七八九十]{1,3}|\d{1,2})[、\.．:：]\s*([^\n]{1,80})",
-        text[start_idx + 1:]
-    ):
+    for m in _ORDINAL_TITLE_LINE_RE.finditer(text, start_idx + 1):
         title = m.group(2)
-        if any(kw in title for kw in title_keywords):
-            candidates.append(start_idx + 1 + m.start())
+        if has_keyword(title):
+            hit = m.start()
             break
 
-    for m in re.finditer(
-        r"(?:^|\n)\s*[（(][一二三四五六七八九十0-9]{1,3}[）)]\s*([^\n]{1,80})",
-        text[start_idx + 1:]
-    ):
+    # 只取两类标题里更靠前的那条：括号标题扫到一级标题命中位置就可以停，不必扫完全文
+    for m in _BRACKET_TITLE_LINE_RE.finditer(text, start_idx + 1):
+        if hit is not None and m.start() >= hit:
+            break
         title = m.group(1)
-        if any(kw in title for kw in title_keywords):
-            candidates.append(start_idx + 1 + m.start())
+        if has_keyword(title):
+            hit = m.start()
             break
 
-    if not candidates:
+    if hit is None:
         return None
 
-    end_idx = min(candidates)
+    end_idx = hit
     return text[start_idx:end_idx].strip()
 
 
-def slice_to_next_major_heading(text, start_idx, major_heading_keywords):
+def slice_to_next_major_heading(text: str, start_idx: int | None, major_heading_keywords: Sequence[str]) -> str | None:
     """
     从 start_idx 切到“下一条重大一级标题”（标题行包含 major_heading_keywords）。
     """
     if start_idx is None or start_idx < 0:
         return None
 
-    heading_iter = re.finditer(
-        r"(?:\n\s*([一二三四五六七八九十]{1,3}|\d{1,2})、([^\n]{1,60}))",
-        text[start_idx + 1:]
-    )
+    heading_iter = _MAJOR_TITLE_LINE_RE.finditer(text, start_idx + 1)
+    has_keyword = _title_keyword_search(tuple(major_heading_keywords))
 
     for m in heading_iter:
         title = m.group(2)
-        if any(kw in title for kw in major_heading_keywords):
-            end_idx = start_idx + 1 + m.start()
+        if has_keyword(title):
+            end_idx = m.start()
             return text[start_idx:end_idx].strip()
 
     return None
 
 
-def next_ordinal_candidates(current_ordinal: str):
-    """给定当前一级序号，返回可能的下一个一级序号候选列表。"""
-    cn_list = ["一", "二", "三", "四", "五", "六", "七", "八", "九", "十",
-               "十一", "十二", "十三", "十四", "十五", "十六", "十七", "十八", "十九", "二十"]
-    cn_to_ar = {"一": "1", "二": "2", "三": "3", "四": "4", "五": "5", "六": "6", "七": "7", "八": "8", "九": "9", "十": "10",
-                "十一": "11", "十二": "12", "十三": "13", "十四": "14", "十五": "15", "十六": "16", "十七": "17", "十八": "18", "十九": "19", "二十": "20"}
-    ar_to_cn = {v: k for k, v in cn_to_ar.items()}
-
-    cur_cn = current_ordinal
-    if re.fullmatch(r"\d{1,2}", current_ordinal):
-        cur_cn = ar_to_cn.get(current_ordinal)
+_CN_ORDINALS = ("一", "二", "三", "四", "五", "六", "七", "八", "九", "十",
+                "十一", "十二", "十三", "十四", "十五", "十六", "十七", "十八", "十九", "二十")
+# 当前一级序号（中文或阿拉伯数字）-> (下一个中文序号, 下一个阿拉伯序号)
+_NEXT_ORDINAL: dict[str, tuple[str, str]] = {}
+for _i, _cn in enumerate(_CN_ORDINALS[:-1]):
+    _NEXT_ORDINAL[_cn] = _NEXT_ORDINAL[str(_i + 1)] = (_CN_ORDINALS[_i + 1], str(_i + 2))
+del _i, _cn
 
-    if cur_cn in cn_list:
-        idx = cn_list.index(cur_cn)
-        if idx + 1 < len(cn_list):
-            nxt_cn = cn_list[idx + 1]
-            nxt_ar = cn_to_ar.get(nxt_cn)
-            return [nxt_cn, nxt_ar] if nxt_ar else [nxt_cn]
 
-    return []
+def next_ordinal_candidates(current_ordinal: str) -> list[str]:
+    """给定当前一级序号，返回可能的下一个一级序号候选列表。"""
+    return list(_NEXT_ORDINAL.get(current_ordinal, ()))
 
 
-def slice_to_next_ordinal(text, start_idx, current_ordinal: str, major_heading_keywords):
+def slice_to_next_ordinal(
+    text: str,
+    start_idx: int | None,
+    current_ordinal: str,
+    major_heading_keywords: Sequence[str],
+) -> str | None:
     """从 start_idx 开始切片到下一一级序号。"""
     if start_idx is None or start_idx < 0:
         return None
@@ -114,34 +299,33 @@ def slice_to_next_ordinal(text, start_idx, current_ordinal: str, major_heading_k
 
     candidates = next_ordinal_candidates(current_ordinal)
 
-    def _cand_regex(c: str) -> str:
-        if re.fullmatch(r"\d{1,2}", c):
-            return re.escape(c)
-        return r"\\s*".join(re.escape(ch) for ch in c)
-
     end_positions = []
     for cand in candidates:
         if not cand:
             continue
-        cand_pat = _cand_regex(cand)
-        m = re.search(rf"(?:^|\n)\s*{cand_pat}\s*、", text[start_idx + 1:])
+        m = _next_ordinal_res(cand)[0].search(text, start_idx + 1)
         if m:
-            end_positions.append(start_idx + 1 + m.start())
+            end_positions.append(m.start())
 
     if not end_positions and candidates:
         for cand in candidates:
             if not cand:
                 continue
-            cand_pat = _cand_regex(cand)
-            m2 = re.search(rf"{cand_pat}\s*、", text[start_idx + 1:])
+            m2 = _next_ordinal_res(cand)[1].search(text, start_idx + 1)
             if m2:
-                end_positions.append(start_idx + 1 + m2.start())
+                end_positions.append(m2.start())
 
     end_idx = min(end_positions) if end_positions else len(text)
     return text[start_idx:end_idx].strip()
 
 
-def extract_section_by_ordinal(text, ordinal_cn, keyword_fallback=None, *, major_heading_keywords):
+def extract_section_by_ordinal(
+    text: str,
+    ordinal_cn: str,
+    keyword_fallback: Sequence[str] | None = None,
+    *,
+    major_heading_keywords: Sequence[str],
+) -> str | None:
     """按同级序号提取段落。"""
     cn_to_arabic = {"一": "1", "二": "2", "三": "3", "四": "4", "五": "5",
                     "六": "6", "七": "7", "八": "8", "九": "9", "十": "10",
@@ -149,30 +333,30 @@ def extract_section_by_ordinal(text, ordinal_cn, keyword_fallback=None, *, major
 
     start_idx = None
 
-    m1 = re.search(rf"(?:^|\n)\s*{ordinal_cn}、", text)
+    m1 = _ordinal_start_res(ordinal_cn)[0].search(text)
     if m1:
         start_idx = m1.start()
     else:
         arabic = cn_to_arabic.get(ordinal_cn)
         if arabic:
-            m2 = re.search(rf"(?:^|\n)\s*{arabic}、", text)
+            m2 = _ordinal_start_res(arabic)[0].search(text)
             if m2:
                 start_idx = m2.start()
 
     if start_idx is None:
-        m3 = re.search(rf"(?:^|\n)\s*(?:（{ordinal_cn}）|\({ordinal_cn}\))", text)
+        m3 = _ordinal_start_res(ordinal_cn)[1].search(text)
         if m3:
             start_idx = m3.start()
         else:
             arabic = cn_to_arabic.get(ordinal_cn)
             if arabic:
-                m4 = re.search(rf"(?:^|\n)\s*(?:（{arabic}）|\({arabic}\))", text)
+                m4 = _ordinal_start_res(arabic)[1].search(text)
                 if m4:
                     start_idx = m4.start()
 
     if start_idx is None and keyword_fallback:
         for kw in keyword_fallback:
-            mk = re.search(rf"(?:^|\n)\s*{kw}", text)
+            mk = _line_start_re(kw).search(text)
             if mk:
                 start_idx = mk.start()
                 break
@@ -180,17 +364,19 @@ def extract_section_by_ordinal(text, ordinal_cn, keyword_fallback=None, *, major
     return slice_to_next_ordinal(text, start_idx, ordinal_cn, major_heading_keywords)
 
 
-def extract_section_by_keywords(text, keywords, fallback_ordinals=None, end_title_keywords=None, *, major_heading_keywords):
+def extract_section_by_keywords(
+    text: str,
+    keywords: Sequence[str],
+    fallback_ordinals: Sequence[str] | None = None,
+    end_title_keywords: Sequence[str] | None = None,
+    *,
+    major_heading_keywords: Sequence[str],
+) -> str | None:
     """
     通过“一级标题行（序号 + 顿号）+ 关键词”定位并提取整段，并按该序号切到下一序号。
     """
     for kw in keywords:
-        kw_pat = kw[len("REGEX:"):] if isinstance(kw, str) and kw.startswith("REGEX:") else re.escape(str(kw))
-
-        m = re.search(
-            rf"(?:^|\n)\s*([一二三四五六七八九十]{{1,3}}|\d{{1,2}})[、\.．:：]\s*[^\n]*{kw_pat}[^\n]*",
-            text
-        )
+        m = search_heading(_keyword_heading_res(kw)[0], text, ORDINAL_HEADING)
         if m:
             start = m.start()
             ordinal = m.group(1)
@@ -204,11 +390,7 @@ def extract_section_by_keywords(text, keywords, fallback_ordinals=None, end_titl
             return slice_to_next_ordinal(text, start, ordinal, major_heading_keywords)
 
     for kw in keywords:
-        kw_pat = kw[len("REGEX:"):] if isinstance(kw, str) and kw.startswith("REGEX:") else re.escape(str(kw))
-        m = re.search(
-            rf"(?:^|\n)\s*(\d+(?:[\.．]\d+){{1,3}})\s*[、\.．:：]?\s*[^\n]*{kw_pat}[^\n]*",
-            text
-        )
+        m = search_heading(_keyword_heading_res(kw)[1], text, DOTTED_HEADING)
         if not m:
             continue
 
@@ -219,30 +401,25 @@ def extract_section_by_keywords(text, keywords, fallback_ordinals=None, end_titl
             if sliced:
                 return sliced
 
-        tail = text[start + 1:]
         end_candidates: list[int] = []
 
-        m_dot = re.search(r"(?:^|\n)\s*\d+(?:[\.．]\d+){1,3}\b", tail)
+        m_dot = _DOTTED_NUM_HEAD_RE.search(text, start + 1)
         if m_dot:
-            end_candidates.append(start + 1 + m_dot.start())
+            end_candidates.append(m_dot.start())
 
-        m_ord = re.search(r"(?:^|\n)\s*(?:[一二三四五六七八九十]{1,3}|\d{1,2})[、\.．:：]", tail)
+        m_ord = _ORDINAL_HEAD_RE.search(text, start + 1)
         if m_ord:
-            end_candidates.append(start + 1 + m_ord.start())
+            end_candidates.append(m_ord.start())
 
-        m_ch = re.search(r"(?:^|\n)\s*第\s*[一二三四五六七八九十]{1,3}\s*[章节]", tail)
+        m_ch = _CHAPTER_HEAD_RE.search(text, start + 1)
         if m_ch:
-            end_candidates.append(start + 1 + m_ch.start())
+            end_candidates.append(m_ch.start())
 
         end_idx = min(end_candidates) if end_candidates else len(text)
         return text[start:end_idx].strip()
 
     for kw in keywords:
-        kw_pat = kw[len("REGEX:"):] if isinstance(kw, str) and kw.startswith("REGEX:") else re.escape(str(kw))
-        m = re.search(
-            rf"(?:^|\n)\s*[（(]([一二三四五六七八九十0-9]{{1,3}})[）)]\s*[^\n]*{kw_pat}[^\n]*",
-            text
-        )
+        m = search_heading(_keyword_heading_res(kw)[2], text, BRACKET_HEADING)
         if m:
             start = m.start()
             sliced = slice_to_next_bracket_heading(text, start)
@@ -258,7 +435,6 @@ def extract_section_by_keywords(text, keywords, fallback_ordinals=None, end_titl
     return None
 
 
-def extract_section(text, title):
-    pattern = rf"{title}[\s\S]*?(?=\n[一二三四五六七八九十]+、|\Z)"
-    match = re.search(pattern, text)
+def extract_section(text: str, title: str) -> str | None:
+    match = _section_re(title).search(text)
     return match.group(0).strip() if match else None
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import io
+import os
+import re
+from typing import Iterator
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfdocument import PDFDocument
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from pdfminer.pdfparser import PDFParser
+
+# PyMuPDF（C 实现）抽取文本比 pdfminer 快一个数量级，但只在显式开启时使用（见 use_pymupdf）。
+# 新版包名是 pymupdf，老版本只有 fitz。
+try:
+    import pymupdf
+except Exception:
+    try:
+        import fitz as pymupdf  # type: ignore
+    except Exception:
+        pymupdf = None
+PYMUPDF_AVAILABLE = pymupdf is not None
+
+# 只数页数时 pypdf 读交叉引用表 + 页树即可，不像 pdfplumber 那样为每页建对象。
+try:
+    from pypdf import PdfReader
+    PYPDF_AVAILABLE = True
+except Exception:
+    PdfReader = None
+    PYPDF_AVAILABLE = False
+
+
+def use_pymupdf() -> bool:
+    """PyMuPDF backend is opt-in: REPORTCLAW_PDF_BACKEND=pymupdf (main.py sets it from [perf] pdf_backend).
+
+    默认仍是 pdfminer：parser_sections / main 的章节正则是按 pdfminer 的文本版式调出来的，
+    PyMuPDF 的换行和空白不同，还没有在真实年报上逐份比对过章节边界。
+    按环境变量判断，parse worker 进程也能继承同一设置。
+    """
+    return PYMUPDF_AVAILABLE and os.environ.get("REPORTCLAW_PDF_BACKEND", "").strip().lower() == "pymupdf"
+
+
+def _iter_doc_pages(doc, page_numbers=None) -> Iterator[tuple[int, str]]:
+    n = doc.page_count
+    pages = range(n) if page_numbers is None else sorted({int(p) for p in page_numbers if 0 <= int(p) < n})
+    for p in pages:
+        try:
+            yield p, doc[p].get_text("text") or ""
+        except Exception:
+            yield p, ""
+
+
+def _probe_doc_pages(doc, sample_pages: int) -> tuple[int, int, int]:
+    n = min(sample_pages, doc.page_count)
+    img_cnt = 0
+    txt_cnt = 0
+    for i in range(n):
+        page = doc[i]
+        try:
+            img_cnt += len(page.get_images(full=False) or [])
+        except Exception:
+            pass
+        try:
+            txt_cnt += len(re.sub(r"\s+", "", page.get_text("text") or ""))
+        except Exception:
+            pass
+    return n, img_cnt, txt_cnt
+
+
+def iter_page_texts(pdf_path: str, page_numbers=None) -> Iterator[tuple[int, str]]:
+    """Yield (page_index, raw_text) one page at a time.
+
+    page_numbers: 0-based page indexes (None = all pages). Pages beyond the end are skipped.
+    """
+    if use_pymupdf():
+        try:
+            doc = pymupdf.open(pdf_path)
+        except Exception:
+            doc = None
+        if doc is not None:
+            try:
+                yield from _iter_doc_pages(doc, page_numbers)
+            finally:
+                doc.close()
+            return
+
+    yield from _iter_page_texts_pdfminer(pdf_path, page_numbers)
+
+
+class _PdfminerPages:
+    """pdfminer fallback with one parser / resource manager / interpreter per PDF.
+
+    pdfminer.high_level.extract_text rebuilds all of these (and re-walks the page tree) on every
+    call; here fonts and other resources stay cached across batches of the same document.
+    Same LAParams defaults as extract_text, so the per-page text is identical.
+    """
+
+    def __init__(self, pdf_path: str):
+        self._fp = open(pdf_path, "rb")
+        try:
+            self._pages = list(PDFPage.create_pages(PDFDocument(PDFParser(self._fp))))
+        except Exception:
+            self._fp.close()
+            raise
+        self._out = io.StringIO()
+        rsrcmgr = PDFResourceManager(caching=True)
+        self._device = TextConverter(rsrcmgr, self._out, codec="utf-8", laparams=LAParams())
+        self._interpreter = PDFPageInterpreter(rsrcmgr, self._device)
+
+    def iter_page_texts(self, page_numbers=None) -> Iterator[tuple[int, str]]:
+        n = len(self._pages)
+        pages = range(n) if page_numbers is None else sorted({int(p) for p in page_numbers if 0 <= int(p) < n})
+        for p in pages:
+            self._out.seek(0)
+            self._out.truncate(0)
+            try:
+                self._interpreter.process_page(self._pages[p])
+            except Exception:
+                yield p, ""
+                continue
+            # TextConverter 在每页末尾写一个 \f
+            text = self._out.getvalue()
+            yield p, text[:-1] if text.endswith("\x0c") else text
+
+    def close(self) -> None:
+        try:
+            self._device.close()
+        finally:
+            self._fp.close()
+
+
+def _iter_page_texts_pdfminer(pdf_path: str, page_numbers=None) -> Iterator[tuple[int, str]]:
+    pages = _PdfminerPages(pdf_path)
+    try:
+        yield from pages.iter_page_texts(page_numbers)
+    finally:
+        pages.close()
+
+
+def extract_text(pdf_path: str, page_numbers=None) -> str:
+    """Same output format as pdfminer.high_level.extract_text: every page is followed by \\x0c."""
+    return "".join(f"{text}\x0c" for _, text in iter_page_texts(pdf_path, page_numbers))
+
+
+def probe_pages(pdf_path: str, sample_pages: int) -> tuple[int, int, int]:
+    """Return (pages_sampled, image_count, non_whitespace_text_chars) for the first sample_pages pages.
+
+    Used by the image-heavy preflight. Raises if the PDF cannot be opened.
+    """
+    if use_pymupdf():
+        with pymupdf.open(pdf_path) as doc:
+            return _probe_doc_pages(doc, sample_pages)
+
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        n = min(sample_pages, len(pdf.pages))
+        img_cnt = 0
+        txt_cnt = 0
+        for i in range(n):
+            p = pdf.pages[i]
+
+            # image count (cheap)
+            try:
+                img_cnt += len(getattr(p, "images", []) or [])
+            except Exception:
+                pass
+
+            # text probe (cheap)
+            try:
+                s = p.extract_text() or ""
+                txt_cnt += len(re.sub(r"\s+", "", s))
+            except Exception:
+                pass
+        return n, img_cnt, txt_cnt
+
+
+def page_count(pdf_path: str) -> int:
+    """Number of pages: PyMuPDF, then pypdf, then pdfplumber. Raises if none can open the file."""
+    if use_pymupdf():
+        try:
+            with pymupdf.open(pdf_path) as doc:
+                return doc.page_count
+        except Exception:
+            pass
+    if PYPDF_AVAILABLE:
+        try:
+            return len(PdfReader(pdf_path, strict=False).pages)
+        except Exception:
+            pass
+
+    import pdfplumber
+
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+class PdfDocument:
+    """One PDF opened once for repeated reads (preflight probe, batched page text, front matter).
+
+    With PyMuPDF the document handle stays open until close(); without it text comes from a
+    persistent pdfminer interpreter (opened on first read) and the image probe from pdfplumber.
+    """
+
+    def __init__(self, pdf_path: str):
+        self.pdf_path = pdf_path
+        self._doc = None
+        self._miner: _PdfminerPages | None = None
+        if use_pymupdf():
+            try:
+                self._doc = pymupdf.open(pdf_path)
+            except Exception:
+                self._doc = None
+
+    def iter_page_texts(self, page_numbers=None) -> Iterator[tuple[int, str]]:
+        if self._doc is not None:
+            return _iter_doc_pages(self._doc, page_numbers)
+        if self._miner is None:
+            self._miner = _PdfminerPages(self.pdf_path)
+        return self._miner.iter_page_texts(page_numbers)
+
+    def extract_text(self, page_numbers=None) -> str:
+        """Same format as the module-level extract_text (every page followed by \\x0c)."""
+        return "".join(f"{text}\x0c" for _, text in self.iter_page_texts(page_numbers))
+
+    def probe_pages(self, sample_pages: int) -> tuple[int, int, int]:
+        if self._doc is not None:
+            return _probe_doc_pages(self._doc, sample_pages)
+        return probe_pages(self.pdf_path, sample_pages)
+
+    def close(self) -> None:
+        if self._doc is not None:
+            try:
+                self._doc.close()
+            except Exception:
+                pass
+            self._doc = None
+        if self._miner is not None:
+            try:
+                self._miner.close()
+            except Exception:
+                pass
+            self._miner = None
+
+    def __enter__(self) -> "PdfDocument":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
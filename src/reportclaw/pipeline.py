@@ -5,7 +5,7 @@ import os
 import re
 import time
 from datetime import datetime
-from typing import Any
+from typing import Any, Iterator
 
 import requests
 
@@ -17,6 +17,25 @@ def guess_cninfo_exchange(stock_code: str) -> tuple[str, str]:
     return "szse", "sz"
 
 
+def _announcement_ts(t: Any) -> float | None:
+    """announcementTime（毫秒/秒整数、数字串或 YYYY-MM-DD 开头的字符串）-> epoch 秒；无法解析返回 None。"""
+    if isinstance(t, int):
+        return t / 1000 if t > 1e12 else t
+    if isinstance(t, str):
+        if t.isdigit():
+            ti = int(t)
+            return ti / 1000 if ti > 1e12 else ti
+        try:
+            return datetime.strptime(t[:10], "%Y-%m-%d").timestamp()
+        except Exception:
+            return None
+    return None
+
+
+_YEAR_IN_TITLE_RE = re.compile(r"(20\d{2})\s*年?\s*年度报告")
+_YEAR_PREFIX_RE = re.compile(r"^(20\d{2})")
+
+
 def _download_pdf_task(args: tuple[dict, str, requests.Session, tuple[int, int], int]) -> tuple[bool, str]:
     """Download a PDF if missing.
 
@@ -32,25 +51,28 @@ def _download_pdf_task(args: tuple[dict, str, requests.Session, tuple[int, int],
             return False, "no adjunctUrl"
         pdf_url = "http://static.cninfo.com.cn/" + adj_url
 
-        pdf_resp = None
+        # 流式落盘：边收边写，不在内存里攒整份 PDF（5~30MB × 并发数）。
+        # 先写 .part 再原子改名，中途失败不会留下被 os.path.exists 误判为“已下载”的半截文件。
+        tmp_path = file_path + ".part"
         for attempt in range(1, max_retry + 1):
             try:
-                pdf_resp = session.get(pdf_url, timeout=get_timeout)
-                pdf_resp.raise_for_status()
-                break
+                with session.get(pdf_url, timeout=get_timeout, stream=True) as pdf_resp:
+                    pdf_resp.raise_for_status()
+                    with open(tmp_path, "wb") as f:
+                        for chunk in pdf_resp.iter_content(chunk_size=65536):
+                            f.write(chunk)
+                os.replace(tmp_path, file_path)
+                return True, "downloaded"
             except Exception as e:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
                 if attempt == max_retry:
-                    pdf_resp = None
                     return False, f"download failed: {e}"
                 time.sleep(0.8 * attempt)
 
-        if pdf_resp is None:
-            return False, "download failed"
-
-        with open(file_path, "wb") as f:
-            f.write(pdf_resp.content)
-
-        return True, "downloaded"
+        return False, "download failed"
     except Exception as e:
         return False, f"download exception: {e}"
 
@@ -127,26 +149,11 @@ def fetch_candidate_announcements(
             announcements = result.get("announcements") or []
             print(f"[{col}] 第 {page} 页返回 {len(announcements)} 条公告")
 
-            oldest_ts = None
-            newest_ts = None
-            for a in announcements:
-                t = a.get("announcementTime")
-                ts = None
-                if isinstance(t, int):
-                    ts = t / 1000 if t > 1e12 else t
-                elif isinstance(t, str):
-                    if t.isdigit():
-                        ti = int(t)
-                        ts = ti / 1000 if ti > 1e12 else ti
-                    else:
-                        try:
-                            ts = datetime.strptime(t[:10], "%Y-%m-%d").timestamp()
-                        except Exception:
-                            ts = None
-                if ts is None:
-                    continue
-                oldest_ts = ts if oldest_ts is None else min(oldest_ts, ts)
-                newest_ts = ts if newest_ts is None else max(newest_ts, ts)
+            # 每条公告的时间只解析一次：窗口判断和下面的逐条过滤共用
+            page_ts = [_announcement_ts(a.get("announcementTime")) for a in announcements]
+            valid_ts = [ts for ts in page_ts if ts is not None]
+            oldest_ts = min(valid_ts) if valid_ts else None
+            newest_ts = max(valid_ts) if valid_ts else None
 
             if oldest_ts is not None and oldest_ts < start_ts:
                 print(
@@ -173,7 +180,7 @@ def fetch_candidate_announcements(
                 for a in announcements:
                     print("[SSE DEBUG]", a.get("secCode"), a.get("secName"), a.get("announcementTitle"), a.get("announcementTime"))
 
-            for ann in announcements:
+            for ann, ann_ts in zip(announcements, page_ts):
                 title = ann.get("announcementTitle") or ""
                 if "年度报告" not in title:
                     continue
@@ -182,11 +189,11 @@ def fetch_candidate_announcements(
                 if "关于" in title and "年度报告" not in title.split("关于")[0]:
                     continue
 
-                year_match = re.search(r"(20\d{2})\s*年?\s*年度报告", title)
+                year_match = _YEAR_IN_TITLE_RE.search(title)
                 if year_match:
                     year = int(year_match.group(1))
                 else:
-                    m0 = re.match(r"^(20\d{2})", title)
+                    m0 = _YEAR_PREFIX_RE.match(title)
                     if not m0:
                         continue
                     year = int(m0.group(1))
@@ -210,27 +217,15 @@ def fetch_candidate_announcements(
                     continue
 
                 if isinstance(timestamp, int):
-                    ts = timestamp / 1000 if timestamp > 1e12 else timestamp
-                    publish_dt = datetime.fromtimestamp(ts)
-                    publish_date = publish_dt.strftime("%Y-%m-%d")
+                    ts = ann_ts
+                    publish_date = datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
                 else:
+                    # 字符串只认 YYYY-MM-DD 开头（纯数字串在这里一直是跳过的，保持不变）
                     publish_date = str(timestamp)[:10]
-                    try:
-                        publish_dt = datetime.strptime(publish_date, "%Y-%m-%d")
-                        ts = publish_dt.timestamp()
-                    except Exception:
-                        ts = None
-
-                if ts is not None:
-                    if ts < start_ts or ts > end_ts:
-                        continue
-                else:
-                    try:
-                        pd = datetime.strptime(publish_date, "%Y-%m-%d").timestamp()
-                    except Exception:
-                        continue
-                    if pd < start_ts or pd > end_ts:
-                        continue
+                    ts = None if isinstance(timestamp, str) and timestamp.isdigit() else ann_ts
+
+                if ts is None or ts < start_ts or ts > end_ts:
+                    continue
 
                 adj_url = ann.get("adjunctUrl") or ""
                 if not adj_url:
@@ -276,28 +271,59 @@ def dedupe_candidates(candidates: list[dict[str, Any]]) -> list[dict[str, Any]]:
     return items
 
 
-def download_missing_pdfs(
+def iter_downloaded_pdfs(
     candidates: list[dict[str, Any]],
     *,
     session: requests.Session,
     get_timeout: tuple[int, int],
     max_retry: int,
     max_workers_download: int,
-) -> None:
-    """Download candidate PDFs that are not yet present on disk."""
-    to_download: list[tuple[dict, str, requests.Session, tuple[int, int], int]] = []
+) -> Iterator[dict[str, Any]]:
+    """Yield candidates whose PDF is on disk, as soon as each one becomes available.
+
+    Files already present are yielded first; missing ones are downloaded on a thread pool and
+    yielded in completion order, so the caller can start parsing while the rest still download.
+    Failed downloads are logged and not yielded.
+    """
+    to_download: list[dict[str, Any]] = []
     for c in candidates:
-        if not os.path.exists(c["file_path"]):
-            to_download.append((c["ann"], c["file_path"], session, get_timeout, max_retry))
+        if os.path.exists(c["file_path"]):
+            yield c
+        else:
+            to_download.append(c)
 
     if not to_download:
         return
 
     print(f"[perf] downloading missing PDFs: {len(to_download)} (threads={max_workers_download})")
     with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers_download) as ex:
-        futs = [ex.submit(_download_pdf_task, a) for a in to_download]
-        for fut in concurrent.futures.as_completed(futs):
+        fut_map = {
+            ex.submit(_download_pdf_task, (c["ann"], c["file_path"], session, get_timeout, max_retry)): c
+            for c in to_download
+        }
+        for fut in concurrent.futures.as_completed(fut_map):
             ok, msg = fut.result()
             if not ok:
                 print(f"[download] failed: {msg}")
+                continue
+            yield fut_map[fut]
+
+
+def download_missing_pdfs(
+    candidates: list[dict[str, Any]],
+    *,
+    session: requests.Session,
+    get_timeout: tuple[int, int],
+    max_retry: int,
+    max_workers_download: int,
+) -> None:
+    """Download candidate PDFs that are not yet present on disk."""
+    for _ in iter_downloaded_pdfs(
+        candidates,
+        session=session,
+        get_timeout=get_timeout,
+        max_retry=max_retry,
+        max_workers_download=max_workers_download,
+    ):
+        pass
     time.sleep(0.5)
@@ -15,6 +15,7 @@ class MySQLClient:
         * exists(stock_code, year): 判断同公司同年份是否已入库
         * insert_report(...): 写 annual_reports，返回 report_id
         * insert_mda(report_id, mda): 写 annual_report_mda
+        * insert_mda_bulk: 批量写入（executemany + 单次 commit）
 
     约定
     - annual_reports 以 (stock_code, report_year) 作为逻辑唯一键（代码层面去重）。
@@ -34,10 +35,16 @@ class MySQLClient:
             port=config.getint("mysql", "port"),
             user=config["mysql"]["user"],
             password=config["mysql"]["pass"],
-            database=config["mysql"]["db"]
+            database=config["mysql"]["db"],
+            autocommit=False,
         )
         self.annual_reports_columns = self._load_table_columns("annual_reports")
         self.stock_master_columns = self._load_table_columns("stock_master_cn")
+        # preload_existing() 预取的 (stock_code, report_year) -> id；只对已预取的年份生效
+        self._report_ids: dict[tuple[str, int], int] = {}
+        self._preloaded_years: set[int] = set()
+        # preload_mda_complete() 预取的 report_id -> MDA 是否完整；写 MDA 时作废对应条目，回到逐条查询
+        self._mda_complete: dict[int, bool] = {}
 
     def close(self) -> None:
         try:
@@ -46,8 +53,69 @@ class MySQLClient:
         except Exception:
             pass
 
+    def preload_existing(self, years) -> int:
+        """Load all (stock_code, report_year) -> id for the given years with one SELECT.
+
+        之后 get_report_id / exists 对这些年份直接查内存，不再逐条查库。返回新加载的行数。
+        """
+        todo = sorted({int(y) for y in (years or []) if y is not None} - self._preloaded_years)
+        if not todo:
+            return 0
+
+        cursor = self.conn.cursor()
+        cursor.execute(
+            f"SELECT stock_code, report_year, id FROM annual_reports WHERE report_year IN ({', '.join(['%s'] * len(todo))})",
+            tuple(todo),
+        )
+        rows = cursor.fetchall()
+        for code, year, rid in rows:
+            self._report_ids[(str(code), int(year))] = rid
+        self._preloaded_years.update(todo)
+        return len(rows)
+
+    def preload_mda_complete(self, report_ids, chunk_size: int = 500) -> int:
+        """Prefetch is_mda_complete() for the given report ids, chunk_size ids per SELECT.
+
+        只查调用方给出的候选报告（不是整年全部），服务端只读这些行的大字段；
+        没有 MDA 行的报告记为不完整。返回预取的报告数。
+        """
+        todo = sorted({int(r) for r in (report_ids or []) if r is not None} - self._mda_complete.keys())
+        if not todo:
+            return 0
+
+        cursor = self.conn.cursor()
+        for i in range(0, len(todo), chunk_size):
+            chunk = todo[i:i + chunk_size]
+            cursor.execute(
+                f"""
+                SELECT report_id,
+                       LEFT(full_mda, 14) = '[PARSE_FAILED]',
+                       CHAR_LENGTH(industry_section), CHAR_LENGTH(main_business_section),
+                       CHAR_LENGTH(future_section), CHAR_LENGTH(chairman_letter), CHAR_LENGTH(full_mda)
+                FROM annual_report_mda
+                WHERE report_id IN ({', '.join(['%s'] * len(chunk))})
+                """,
+                tuple(chunk),
+            )
+            complete: dict[int, bool] = {}
+            for report_id, failed, *lengths in cursor.fetchall():
+                complete.setdefault(int(report_id), self._mda_row_complete(bool(failed), *lengths))
+            for rid in chunk:
+                self._mda_complete[rid] = complete.get(rid, False)
+        return len(todo)
+
+    def exists(self, stock_code, year) -> bool:
+        return self.get_report_id(stock_code, year) is not None
+
     def get_report_id(self, stock_code, year):
         """Return existing annual_reports.id if present, else None."""
+        try:
+            key = (str(stock_code), int(year))
+        except (TypeError, ValueError):
+            key = None
+        if key is not None and key[1] in self._preloaded_years:
+            return self._report_ids.get(key)
+
         cursor = self.conn.cursor()
         cursor.execute(
             "SELECT id FROM annual_reports WHERE stock_code=%s AND report_year=%s",
@@ -58,6 +126,10 @@ class MySQLClient:
 
     def is_mda_complete(self, report_id: int) -> bool:
         """Treat placeholder/failed parses as NOT complete so the pipeline can retry on later runs."""
+        cached = self._mda_complete.get(report_id)
+        if cached is not None:
+            return cached
+
         cursor = self.conn.cursor()
         cursor.execute(
             """
@@ -73,20 +145,28 @@ class MySQLClient:
             return False
 
         ind, biz, fut, chairman, full = row
+        failed = isinstance(full, str) and full.startswith("[PARSE_FAILED]")
+        full_len = len(full) if isinstance(full, str) else 0
+        return self._mda_row_complete(
+            failed, len(ind or ""), len(biz or ""), len(fut or ""), len(chairman or ""), full_len
+        )
 
-        if isinstance(full, str) and full.startswith("[PARSE_FAILED]"):
+    @staticmethod
+    def _mda_row_complete(failed, ind_len, biz_len, fut_len, chairman_len, full_len) -> bool:
+        """Completeness rule shared by is_mda_complete and preload_mda_complete (field lengths only)."""
+        if failed:
             return False
 
-        if (biz and len(biz) >= 500) or (fut and len(fut) >= 200) or (ind and len(ind) >= 200) or (
-                chairman and len(chairman) >= 200):
+        if (biz_len or 0) >= 500 or (fut_len or 0) >= 200 or (ind_len or 0) >= 200 or (chairman_len or 0) >= 200:
             return True
 
-        if full and isinstance(full, str) and len(full) >= 5000:
+        if (full_len or 0) >= 5000:
             return True
 
         return False
 
-    def upsert_report(self, stock_code, stock_name, year, publish_date, file_path, industry_info=None):
+    def upsert_report(self, stock_code, stock_name, year, publish_date, file_path, industry_info=None, *, commit=True):
+        """commit=False 时不提交，由随后的 insert_mda_bulk 一并提交（报告行与 MDA 同一事务）。"""
         base_data = {
             "stock_code": stock_code,
             "stock_name": stock_name,
@@ -107,7 +187,9 @@ class MySQLClient:
             placeholders = ", ".join(["%s"] * len(cols))
             sql = f"INSERT INTO annual_reports ({', '.join(cols)}) VALUES ({placeholders})"
             cursor.execute(sql, tuple(write_data[c] for c in cols))
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
+            self._remember_report_id(stock_code, year, cursor.lastrowid)
             return cursor.lastrowid
 
         update_data = {k: v for k, v in write_data.items() if k not in {"stock_code", "report_year"}}
@@ -115,7 +197,8 @@ class MySQLClient:
             set_sql = ", ".join([f"{k}=%s" for k in update_data.keys()])
             sql = f"UPDATE annual_reports SET {set_sql} WHERE id=%s"
             cursor.execute(sql, tuple(update_data[k] for k in update_data.keys()) + (existing_id,))
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
 
         return existing_id
 
@@ -209,8 +292,10 @@ class MySQLClient:
         finally:
             cursor.close()
 
-    def upsert_stock_master_industry(self, stock_code: str, stock_name: str, industry_info: dict | None) -> None:
-        """Persist best-effort industry cache into stock_master_cn."""
+    def upsert_stock_master_industry(
+        self, stock_code: str, stock_name: str, industry_info: dict | None, *, commit: bool = True
+    ) -> None:
+        """Persist best-effort industry cache into stock_master_cn (commit=False: caller commits)."""
         code = str(stock_code or "").strip()
         if not code or not industry_info:
             return
@@ -257,7 +342,8 @@ class MySQLClient:
         cursor = self.conn.cursor()
         try:
             cursor.execute(sql, tuple(write_data[c] for c in cols))
-            self.conn.commit()
+            if commit:
+                self.conn.commit()
         finally:
             cursor.close()
 
@@ -367,9 +453,11 @@ class MySQLClient:
         """
         cursor.execute(sql, (stock_code, stock_name, year, publish_date, file_path))
         self.conn.commit()
+        self._remember_report_id(stock_code, year, cursor.lastrowid)
         return cursor.lastrowid
 
     def insert_mda(self, report_id, mda):
+        self._mda_complete.pop(report_id, None)
         cursor = self.conn.cursor()
         cursor.execute("SELECT id FROM annual_report_mda WHERE report_id=%s LIMIT 1", (report_id,))
         row = cursor.fetchone()
@@ -407,6 +495,78 @@ class MySQLClient:
             ))
         self.conn.commit()
 
+    def insert_mda_bulk(self, items) -> int:
+        """Upsert many annual_report_mda rows with executemany and a single commit.
+
+        这次 commit 同时提交连接上尚未提交的写入（upsert_report(commit=False) 的报告行）。
+
+        items: iterable of (report_id, mda_dict)，同一 report_id 出现多次时以最后一次为准。
+        Returns the number of rows written.
+        """
+        latest: dict[int, dict] = {}
+        for report_id, mda in items or []:
+            latest[int(report_id)] = mda or {}
+        if not latest:
+            return 0
+        for report_id in latest:
+            self._mda_complete.pop(report_id, None)
+
+        cursor = self.conn.cursor()
+        ids = list(latest.keys())
+        cursor.execute(
+            f"SELECT DISTINCT report_id FROM annual_report_mda WHERE report_id IN ({', '.join(['%s'] * len(ids))})",
+            tuple(ids),
+        )
+        existing = {int(r[0]) for r in cursor.fetchall()}
+
+        update_params = []
+        insert_params = []
+        for report_id, mda in latest.items():
+            values = (
+                mda.get("industry"),
+                mda.get("business"),
+                mda.get("future"),
+                mda.get("chairman_letter"),
+                mda.get("full_mda"),
+            )
+            if report_id in existing:
+                update_params.append(values + (report_id,))
+            else:
+                insert_params.append((report_id,) + values)
+
+        if update_params:
+            cursor.executemany(
+                """
+                UPDATE annual_report_mda
+                SET industry_section=%s,
+                    main_business_section=%s,
+                    future_section=%s,
+                    chairman_letter=%s,
+                    full_mda=%s
+                WHERE report_id=%s
+                """,
+                update_params,
+            )
+        if insert_params:
+            cursor.executemany(
+                """
+                INSERT INTO annual_report_mda
+                (report_id, industry_section, main_business_section, future_section, chairman_letter, full_mda)
+                VALUES (%s, %s, %s, %s, %s, %s)
+                """,
+                insert_params,
+            )
+        self.conn.commit()
+        return len(latest)
+
+    def _remember_report_id(self, stock_code, year, report_id) -> None:
+        try:
+            key = (str(stock_code), int(year))
+        except (TypeError, ValueError):
+            return
+        if key[1] in self._preloaded_years and report_id:
+            self._report_ids[key] = report_id
+
     def _load_table_columns(self, table_name: str) -> set[str]:
         cursor = self.conn.cursor()
         cursor.execute(f"SHOW COLUMNS FROM {table_name}")
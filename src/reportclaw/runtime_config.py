@@ -22,6 +22,9 @@ class MainRuntimeConfig:
     max_workers_download: int
     max_workers_parse: int
     parse_backend: str
+    parse_cache: bool = True
+    parse_cache_max_entries: int = 5000
+    pdf_backend: str = "pdfminer"
 
 
 def _normalize_stock_code(stock_code: str | None) -> str | None:
@@ -91,11 +94,17 @@ def load_main_runtime_config(
     max_workers_download = 8
     max_workers_parse = max(1, min((os.cpu_count() or 4), 8))
     parse_backend = "process"
+    parse_cache = True
+    parse_cache_max_entries = 5000
+    pdf_backend = os.environ.get("REPORTCLAW_PDF_BACKEND", "").strip().lower() or "pdfminer"
     try:
         if cfg.has_section("perf"):
             max_workers_download = int(cfg.get("perf", "max_workers_download", fallback=str(max_workers_download)))
             max_workers_parse = int(cfg.get("perf", "max_workers_parse", fallback=str(max_workers_parse)))
             parse_backend = cfg.get("perf", "parse_backend", fallback=parse_backend).strip().lower() or parse_backend
+            parse_cache = cfg.getboolean("perf", "parse_cache", fallback=parse_cache)
+            parse_cache_max_entries = int(cfg.get("perf", "parse_cache_max_entries", fallback=str(parse_cache_max_entries)))
+            pdf_backend = cfg.get("perf", "pdf_backend", fallback=pdf_backend).strip().lower() or pdf_backend
     except Exception:
         pass
 
@@ -111,5 +120,8 @@ def load_main_runtime_config(
         max_workers_download=max_workers_download,
         max_workers_parse=max_workers_parse,
         parse_backend=parse_backend,
+        parse_cache=parse_cache,
+        parse_cache_max_entries=parse_cache_max_entries,
+        pdf_backend=pdf_backend,
     )
     return cfg, runtime
@@ -1,8 +1,50 @@
 from __future__ import annotations
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
+from typing import Any
+
+
+def read_state(path: Path) -> dict[str, Any]:
+    """Read the shared JSON state file; missing or unreadable files yield {}."""
+    try:
+        if not path.exists():
+            return {}
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+        return obj if isinstance(obj, dict) else {}
+    except Exception:
+        return {}
+
+
+def update_state(path: Path, updates: dict[str, Any], remove: tuple[str, ...] = ()) -> None:
+    """Merge `updates` into the shared JSON state file atomically.
+
+    先写同目录临时文件并 fsync，再 os.replace 覆盖：进程在写入中途被杀时，
+    旧文件保持完整，不会出现半截 JSON 导致水位丢失（进而漏发/重发）。
+    Other keys in the file are preserved.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    obj = read_state(path)
+    obj.update(updates)
+    for k in remove:
+        obj.pop(k, None)
+
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            try:
+                tmp.unlink()
+            except Exception:
+                pass
 
 
 def load_last_crawl_ts(path: Path) -> datetime | None:
@@ -16,13 +58,7 @@ def load_last_crawl_ts(path: Path) -> datetime | None:
     - legacy key `last_end_iso` is still accepted.
     """
     try:
-        if not path.exists():
-            return None
-        with open(path, "r", encoding="utf-8") as f:
-            obj = json.load(f)
-        if not isinstance(obj, dict):
-            return None
-
+        obj = read_state(path)
         raw = obj.get("last_crawl_end_iso") or obj.get("last_end_iso")
         if not raw:
             return None
@@ -41,20 +77,6 @@ def load_last_crawl_ts(path: Path) -> datetime | None:
 def save_last_crawl_ts(path: Path, dt: datetime) -> None:
     """Persist crawler watermark without overwriting other shared state keys."""
     try:
-        path.parent.mkdir(parents=True, exist_ok=True)
-        obj: dict = {}
-        if path.exists():
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    old = json.load(f)
-                if isinstance(old, dict):
-                    obj.update(old)
-            except Exception:
-                obj = {}
-
-        obj["last_crawl_end_iso"] = dt.isoformat(timespec="seconds")
-
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(obj, f, ensure_ascii=False, indent=2)
+        update_state(path, {"last_crawl_end_iso": dt.isoformat(timespec="seconds")})
     except Exception:
         pass